@@ -1,32 +1,57 @@
+import os
 from pathlib import Path
 
 import numpy as np
-import pandas as pd
-from pykalman import KalmanFilter
+import pyarrow.csv as pacsv
+import matplotlib
+matplotlib.use("Agg")  # Безопасно для параллельной отрисовки без GUI
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from joblib import Parallel, delayed
+
+from kalman_em_2d import _forward, _rts_smooth, _em_update
 
 def get_list_csv(path_dir: Path) -> list[Path]:
-    return [file for file in path_dir.iterdir() if file.suffix == ".csv"]
+    # os.scandir отдает DirEntry с кэшированным типом файла - без лишних stat-вызовов
+    return [Path(entry.path) for entry in os.scandir(path_dir) if entry.is_file() and entry.name.endswith(".csv")]
 
 def read_data(path: Path) -> np.ndarray:
-    df = pd.read_csv(path)
-    df = df.dropna()
-    df.sort_values(by="time", inplace=True, ignore_index=True)
-    data = df[['lon', 'lat']].to_numpy()
-    return data
+    # Arrow-читалка: многопоточный парсинг и выборка колонок без копий
+    table = pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(include_columns=["time", "lon", "lat"]),
+    )
+    table = table.drop_null().sort_by([("time", "ascending")])
+    data = np.column_stack([
+        table.column("lon").to_numpy(zero_copy_only=False),
+        table.column("lat").to_numpy(zero_copy_only=False),
+    ])
+    return np.ascontiguousarray(data, dtype=np.float64)
+
+# Одна фигура на процесс: переиспользуется между файлами вместо создания новой
+_figure = None
+
 
 def print_results(smoothed_state_means: np.ndarray, data: np.ndarray, name_file: Path = None) -> None:
-    plt.figure(figsize=(10, 6))
-    plt.plot(data[:, 0], data[:, 1], 'ro', label='Наблюдения', alpha=0.5)
-    plt.plot(smoothed_state_means[:, 0], smoothed_state_means[:, 1], 'b-', label='Сглаженные состояния')
-    plt.xlabel('Долгота')
-    plt.ylabel('Широта')
-    plt.title('Сравнение измерений и сглаженной траектории')
-    plt.legend()
-    plt.grid()
+    global _figure
+    if _figure is None:
+        _figure = plt.figure(figsize=(10, 6))
+    fig = _figure
+    fig.clf()
+    ax = fig.add_subplot(111)
+
+    # Одна коллекция линий вместо тысяч Line2D-сегментов
+    ax.scatter(data[:, 0], data[:, 1], s=4, c='r', alpha=0.5, label='Наблюдения')
+    ax.add_collection(LineCollection([smoothed_state_means], colors='b', label='Сглаженные состояния'))
+    ax.autoscale()
+    ax.set_xlabel('Долгота')
+    ax.set_ylabel('Широта')
+    ax.set_title('Сравнение измерений и сглаженной траектории')
+    ax.legend()
+    ax.grid()
 
     if name_file:
-        plt.savefig(name_file)
+        fig.savefig(name_file, dpi=80)
     else:
         plt.show()
 
@@ -38,82 +63,163 @@ def normalize_data(data):
     return (data - mean) / std, mean, std
 
 
-def em_algorithm(data: np.ndarray, n_iter: int = 100):
-    # Начальные приближения
-    A_init = np.eye(2)
-    Q_init = np.eye(2) * 0.1
-    R_init = np.eye(2) * 0.1
+def em_algorithm(data: np.ndarray, n_iter: int = 100, tol: float = 1e-6,
+                 A_init: np.ndarray = None, Q_init: np.ndarray = None, R_init: np.ndarray = None,
+                 direction: str = "forward"):
+    # Начальные приближения (либо теплый старт от предыдущего файла)
+    if A_init is None:
+        A_init = np.eye(2)
+    if Q_init is None:
+        Q_init = np.eye(2) * 0.1
+    if R_init is None:
+        R_init = np.eye(2) * 0.1
 
     # data, mean, std = normalize_data(data)
     data = data[::100]
 
     # Подготовка данных: все наблюдения, включая первое
-    observations = data  # Используем все данные
-
-    # Инициализация модели
-    kf = KalmanFilter(
-        n_dim_obs=2,  # Размерность наблюдений
-        n_dim_state=2,  # Размерность состояния
-        initial_state_mean=data[0],  # x_0 = data[0]
-        initial_state_covariance=np.zeros((2, 2)),  # x_0 известно точно
-        transition_matrices=A_init,
-        transition_covariance=Q_init,
-        observation_matrices=np.eye(2),  # H = I
-        observation_covariance=R_init
+    # Непрерывный float64-буфер: срез data[::100] иначе остается страйдовым видом,
+    # и фильтр на каждой итерации ходил бы по памяти с кэш-промахами
+    observations = np.ascontiguousarray(data, dtype=np.float64)  # Используем все данные
+
+    # Обратный проход идет по тому же непрерывному буферу с конца:
+    # развернутая копия data[::-1] не создается
+    reverse = direction == "backward"
+
+    # Инициализация модели: x_0 = data[0] известно точно, H = I
+    x0 = observations[-1] if reverse else observations[0]
+    P0 = np.zeros((2, 2))
+
+    A_estimated = A_init
+    Q_estimated = Q_init
+    R_estimated = R_init
+
+    # Обучение с помощью EM-алгоритма с ранней остановкой по сходимости
+    loglik_prev = -np.inf
+    n_used = n_iter
+    for iteration in range(n_iter):
+        filtered_means, filtered_covs, pred_means, pred_covs, loglik = _forward(
+            observations, A_estimated, Q_estimated, R_estimated, x0, P0, reverse
+        )
+        smoothed_means, smoothed_covs, lag_one_covs = _rts_smooth(
+            A_estimated, filtered_means, filtered_covs, pred_means, pred_covs
+        )
+        A_prev = A_estimated
+        A_estimated, Q_estimated, R_estimated = _em_update(
+            observations, smoothed_means, smoothed_covs, lag_one_covs, reverse
+        )
+
+        # Остановка: правдоподобие вышло на плато
+        # (и A перестала меняться по Фробениусу)
+        a_change = np.linalg.norm(A_estimated - A_prev) / np.linalg.norm(A_prev)
+        if abs(loglik - loglik_prev) < tol * abs(loglik_prev) and a_change < 1e-5:
+            n_used = iteration + 1
+            break
+        loglik_prev = loglik
+    print(f"EM: выполнено итераций {n_used} из {n_iter}")
+
+    # Финальное сглаживание с обученными параметрами
+    filtered_means, filtered_covs, pred_means, pred_covs, _ = _forward(
+        observations, A_estimated, Q_estimated, R_estimated, x0, P0, reverse
+    )
+    smoothed_state_means, _, _ = _rts_smooth(
+        A_estimated, filtered_means, filtered_covs, pred_means, pred_covs
     )
 
-    # Обучение с помощью EM-алгоритма
-    kf = kf.em(observations, n_iter=n_iter)
+    return A_estimated, Q_estimated, R_estimated, smoothed_state_means
 
-    A_estimated = kf.transition_matrices
-    Q_estimated = kf.transition_covariance
-    R_estimated = kf.observation_covariance
 
-    smoothed_state_means, _ = kf.smooth(observations)
+# Теплый старт: сошедшиеся матрицы предыдущего файла, обработанного этим процессом.
+# Треки одного сборщика имеют схожую динамику, так что EM сходится за единицы итераций
+warm = {"A": None, "Q": None, "R": None}
+
+
+def em_algorithm_fb(data: np.ndarray, n_iter: int = 100, n_iter_backward: int = 10):
+    """Совмещенный прямой/обратный проход EM-алгоритма.
+
+    Вместо двух независимых запусков по 100 итераций обратный проход
+    инициализируется сошедшимися матрицами прямого прохода, после чего ему
+    достаточно небольшого числа итераций дообучения.
+    Args:
+        data: Массив наблюдений формы (N, 2)
+        n_iter: Число итераций EM для прямого прохода
+        n_iter_backward: Число итераций дообучения для обратного прохода
+    Returns:
+        Кортеж ((A, Q, R, smoothed), (A, Q, R, smoothed)) с результатами
+        прямого и обратного проходов
+    """
+    # Прямой проход: полный цикл EM (с теплым стартом от предыдущего файла)
+    A_fwd, Q_fwd, R_fwd, smoothed_fwd = em_algorithm(
+        data=data, n_iter=n_iter,
+        A_init=warm["A"], Q_init=warm["Q"], R_init=warm["R"],
+    )
+    warm["A"], warm["Q"], warm["R"] = A_fwd, Q_fwd, R_fwd
 
-    return A_estimated, Q_estimated, R_estimated, smoothed_state_means
+    # Обратный проход: тот же прореженный ряд, обход с конца буфера,
+    # параметры стартуют с сошедшихся матриц прямого прохода
+    A_bwd, Q_bwd, R_bwd, smoothed_bwd = em_algorithm(
+        data=data, n_iter=n_iter_backward, direction="backward",
+        A_init=A_fwd.copy(), Q_init=Q_fwd.copy(), R_init=R_fwd.copy(),
+    )
+
+    return (A_fwd, Q_fwd, R_fwd, smoothed_fwd), (A_bwd, Q_bwd, R_bwd, smoothed_bwd)
+
+
+def process_file(file_name: Path) -> list[str]:
+    """Обрабатывает один CSV файл: прямой и обратный проходы EM-алгоритма.
+    Возвращает строки с результатами для записи в лог из главного процесса.
+    """
+    print(f"Обработка файла: {file_name.name}")
+    data = read_data(file_name)
+    results = []
+
+    # Запускаем совмещенный прямой/обратный EM-алгоритм
+    try:
+        forward, backward = em_algorithm_fb(data=data)
+
+        # Выводим результаты прямого прохода
+        A_est, Q_est, R_est, smoothed_state_means = forward
+        result = (f"\nРезультаты {file_name.name}:\n"
+                  f"Оцененная матрица A:\n{A_est}\n"
+                  f"Оцененная матрица Q:\n{Q_est}\n"
+                  f"Оцененная матрица R:\n{R_est}\n")
+        print(result)
+        results.append(result)
+
+        print_results(smoothed_state_means=smoothed_state_means,
+                      data=data,
+                      name_file=file_name.parent.parent / "pictures" / f"{file_name.stem}_result.png")
+
+        # Выводим результаты обратного прохода
+        A_est, Q_est, R_est, smoothed_state_means = backward
+        result = (f"\nРезультаты (обратный порядок) {file_name.name}:\n"
+                  f"Оцененная матрица A:\n{A_est}\n"
+                  f"Оцененная матрица Q:\n{Q_est}\n"
+                  f"Оцененная матрица R:\n{R_est}\n")
+        print(result)
+        results.append(result)
+        print_results(smoothed_state_means=smoothed_state_means,
+                      data=data[::-1],
+                      name_file=file_name.parent.parent / "pictures" / f"{file_name.stem}_result_reverse.png")
+    except:
+        pass
+
+    return results
 
 
 if __name__ == "__main__":
     # data_path = Path(__file__).parent / "output" / "example_0_0.csv"
     path_log = Path(__file__).parent / "em_algorithm_log.txt"
     list_files = get_list_csv(Path(__file__).parent / "output")
-    for file_name in list_files:
-        print(f"Обработка файла: {file_name.name}")
-        data = read_data(file_name)
-
-        # Запускаем EM-алгоритм
-        try:
-            A_est, Q_est, R_est, smoothed_state_means = em_algorithm(data=data)
-
-            # Выводим результаты
-            result = (f"\nРезультаты {file_name.name}:\n"
-                      f"Оцененная матрица A:\n{A_est}\n"
-                      f"Оцененная матрица Q:\n{Q_est}\n"
-                      f"Оцененная матрица R:\n{R_est}\n")
-            print(result)
-            with path_log.open('a', encoding='utf-8') as f:
-                f.write(result)
 
-            print_results(smoothed_state_means=smoothed_state_means,
-                          data=data,
-                          name_file=file_name.parent.parent / "pictures" / f"{file_name.stem}_result.png")
-        except:
-            pass
-
-        data = data[::-1]
-        try:
-            A_est, Q_est, R_est, smoothed_state_means = em_algorithm(data=data)
-            result = (f"\nРезультаты (обратный порядок) {file_name.name}:\n"
-                      f"Оцененная матрица A:\n{A_est}\n"
-                      f"Оцененная матрица Q:\n{Q_est}\n"
-                      f"Оцененная матрица R:\n{R_est}\n")
-            print(result)
-            with path_log.open('a', encoding='utf-8') as f:
+    # Файлы независимы друг от друга - обрабатываем их на всех ядрах
+    all_results = Parallel(n_jobs=-1, backend="loky")(
+        delayed(process_file)(file_name) for file_name in list_files
+    )
+
+    # Пишем лог только из главного процесса, чтобы избежать конкуренции за файл
+    with path_log.open('a', encoding='utf-8') as f:
+        for results in all_results:
+            for result in results:
                 f.write(result)
-            print_results(smoothed_state_means=smoothed_state_means,
-                          data=data,
-                          name_file=file_name.parent.parent / "pictures" / f"{file_name.stem}_result_reverse.png")
-        except:
-            pass
 
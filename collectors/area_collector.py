@@ -1,7 +1,11 @@
 """Модуль для сбора и управления областями (Area) OSM"""
 
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+import numpy as np
+from shapely import STRtree
+from shapely.geometry import box
 
 from ..models.area_model import Area
 
@@ -12,19 +16,53 @@ class AreaCollector:
     (Используется при парсинге данных OSM)
     Attributes:
         _areas (Dict[int, Area]): Словарь областей, ключ - id области
+        _strtree (Optional[STRtree]): Ленивый пространственный индекс областей
     """
 
     def __init__(self):
         self._areas: Dict[int, Area] = {}
+        # Ленивый R-tree по границам областей; сбрасывается при любой мутации
+        self._strtree: Optional[STRtree] = None
+        self._strtree_ids: List[int] = []
 
     def __repr__(self):
         return f"AreaCollector(areas={len(self.areas)})"
 
+    def __getitem__(self, area_id: int) -> Area:
+        """Возвращает область по id напрямую из словаря, без вызова метода."""
+        return self._areas[area_id]
+
+    def __contains__(self, area_id: int) -> bool:
+        """Проверяет наличие области с данным id в коллекции."""
+        return area_id in self._areas
+
     @property
     def areas(self) -> Dict[int, Area]:
         """Словарь всех собранных областей, ключ - id области, значение - объект Area."""
         return self._areas
 
+    @property
+    def lat_array(self) -> np.ndarray:
+        """Опорные широты областей (min/max каждой области) одним массивом float64.
+        Достаточно для вычисления общего ограничивающего прямоугольника.
+        """
+        return np.fromiter(
+            (lat for area in self._areas.values() for lat in (area.min_lat, area.max_lat)),
+            dtype=np.float64,
+            count=2 * len(self._areas),
+        )
+
+    @property
+    def lon_array(self) -> np.ndarray:
+        """Опорные долготы областей (min/max каждой области) одним массивом float64.
+        Достаточно для вычисления общего ограничивающего прямоугольника.
+        """
+        return np.fromiter(
+            (lon for area in self._areas.values() for lon in (area.min_lon, area.max_lon)),
+            dtype=np.float64,
+            count=2 * len(self._areas),
+        )
+
     def add_area(self, area: Area) -> None:
         """Добавляет область в коллекцию.
         При добавлении области с уже существующим ID, она будет перезаписана.
@@ -36,8 +74,9 @@ class AreaCollector:
         if not isinstance(area, Area):
             raise TypeError("area должен быть типа Area")
         if area.id in self._areas:
-            logging.warning(f"Area с id {area.id} уже существует в коллекции. Он будет перезаписан")
+            logging.warning("Area с id %d уже существует в коллекции. Он будет перезаписан", area.id)
         self._areas[area.id] = area
+        self._strtree = None
 
     def replace_area(self, old_area: Area, new_area: Area) -> None:
         """Заменяет существующую область на новую.
@@ -52,6 +91,7 @@ class AreaCollector:
         if old_area.id in self._areas:
             del self._areas[old_area.id]
         self._areas[new_area.id] = new_area
+        self._strtree = None
 
     def remove_area(self, area_id: int) -> bool:
         """Удаляет область из коллекции по идентификатору.
@@ -62,12 +102,14 @@ class AreaCollector:
         """
         if area_id in self._areas:
             del self._areas[area_id]
+            self._strtree = None
             return True
         return False
 
     def clean_areas(self) -> None:
         """Очищает коллекцию областей."""
         self._areas.clear()
+        self._strtree = None
 
     def get_area(self, area_id: int) -> Optional[Area]:
         """Возвращает область по её идентификатору.
@@ -90,13 +132,25 @@ class AreaCollector:
         Returns:
             Словарь областей, пересекающихся с заданной рамкой, ключ - id
         """
-        result = {}
-        for area_id, area in self._areas.items():
-            if (
-                area.min_lat <= max_lat
-                and area.max_lat >= min_lat
-                and area.min_lon <= max_lon
-                and area.max_lon >= min_lon
-            ):
-                result[area_id] = area
-        return result
+        if not self._areas:
+            return {}
+        if self._strtree is None:
+            self._build_strtree()
+        # Запрос без предиката проверяет только ограничивающие прямоугольники -
+        # та же семантика, что у прежнего линейного перебора, но за O(log N)
+        indices = self._strtree.query(box(min_lon, min_lat, max_lon, max_lat))
+        return {self._strtree_ids[i]: self._areas[self._strtree_ids[i]] for i in indices}
+
+    def _build_strtree(self) -> None:
+        """Строит пространственный индекс по геометриям областей.
+        Для областей без построенного полигона используется их
+        ограничивающий прямоугольник.
+        """
+        self._strtree_ids = list(self._areas.keys())
+        geometries = []
+        for area in self._areas.values():
+            polygon = area.shapely_polygon
+            if polygon is None:
+                polygon = box(area.min_lon, area.min_lat, area.max_lon, area.max_lat)
+            geometries.append(polygon)
+        self._strtree = STRtree(geometries)
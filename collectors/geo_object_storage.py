@@ -38,6 +38,7 @@ class GeoObjectStorage:
         self._node_collector = nodes_collector or NodeCollector()
         self._ways_collector = ways_collector or WayCollector()
         self._area_collector = areas_collector or AreaCollector()
+        self._global_bounding_box = None
 
     def __repr__(self):
         return (
@@ -57,6 +58,7 @@ class GeoObjectStorage:
         if not isinstance(collector, NodeCollector):
             raise TypeError("collector должен быть типа NodeCollector")
         self._node_collector = collector
+        self._global_bounding_box = None
 
     @property
     def ways_collector(self) -> WayCollector:
@@ -69,6 +71,7 @@ class GeoObjectStorage:
         if not isinstance(collector, WayCollector):
             raise TypeError("collector должен быть типа WayCollector")
         self._ways_collector = collector
+        self._global_bounding_box = None
 
     @property
     def area_collector(self) -> AreaCollector:
@@ -80,9 +83,27 @@ class GeoObjectStorage:
         if not isinstance(collector, AreaCollector):
             raise TypeError("collector должен быть типа AreaCollector")
         self._area_collector = collector
+        self._global_bounding_box = None
 
     @property
     def global_bounding_box(self):
-        """Вычисляет глобальный bounding box для всех геообъектов."""
-        # min_lat, min_lon, max_lat, max_lon = None, None, None, None
-        return 0, 90, 0, 90  # TODO:  реализую расчет глобального бокса. Пока затычка
+        """Вычисляет глобальный bounding box для всех геообъектов.
+        Returns:
+            Кортеж (min_lat, min_lon, max_lat, max_lon) или None,
+            если хранилище пустое. Результат кэшируется до замены коллекций.
+        """
+        if self._global_bounding_box is None:
+            collectors = (self._node_collector, self._ways_collector, self._area_collector)
+            lat_arrays = [collector.lat_array for collector in collectors]
+            lon_arrays = [collector.lon_array for collector in collectors]
+            lat_arrays = [arr for arr in lat_arrays if arr.size > 0]
+            lon_arrays = [arr for arr in lon_arrays if arr.size > 0]
+            if not lat_arrays:
+                return None
+            self._global_bounding_box = (
+                min(float(arr.min()) for arr in lat_arrays),
+                min(float(arr.min()) for arr in lon_arrays),
+                max(float(arr.max()) for arr in lat_arrays),
+                max(float(arr.max()) for arr in lon_arrays),
+            )
+        return self._global_bounding_box
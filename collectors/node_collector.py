@@ -1,9 +1,16 @@
 """Модуль для сбора и управления узлами OSM"""
 
 import logging
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from ..models.node_model import Node
+from ..shared_files.kd_tree_numba import build_kd_tree, query_kd_tree
+
+# Масштаб фиксированной точки для координат: 1e-7 градуса (~1 см) с запасом
+# умещается в int32, вдвое сокращая трафик памяти массовых обходов
+COORD_SCALE = 1e7
 
 
 class NodeCollector:
@@ -17,15 +24,40 @@ class NodeCollector:
     def __init__(self) -> None:
         super().__init__()
         self._nodes: Dict[int, Node] = {}
+        # Кэш CSR-представления графа соседства; сбрасывается при мутации
+        # коллекции
+        self._csr: Optional[Tuple[np.ndarray, ...]] = None
+        # Ленивое kd-дерево для поиска ближайших узлов; привязано к
+        # конкретному CSR-кортежу и пересобирается вместе с ним
+        self._kdtree: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._kdtree_csr: Optional[Tuple[np.ndarray, ...]] = None
 
     def __repr__(self):
         return f"NodeCollector(nodes={len(self._nodes)}"
 
+    def __getitem__(self, node_id: int) -> Node:
+        """Возвращает узел по id напрямую из словаря, без вызова метода."""
+        return self._nodes[node_id]
+
+    def __contains__(self, node_id: int) -> bool:
+        """Проверяет наличие узла с данным id в коллекции."""
+        return node_id in self._nodes
+
     @property
     def nodes(self) -> Dict[int, Node]:
         """Словарь всех собранных узлов, ключ - id узла, значение - объект Node."""
         return self._nodes
 
+    @property
+    def lat_array(self) -> np.ndarray:
+        """Широты всех узлов коллекции одним массивом float64."""
+        return np.fromiter((node.lat for node in self._nodes.values()), dtype=np.float64, count=len(self._nodes))
+
+    @property
+    def lon_array(self) -> np.ndarray:
+        """Долготы всех узлов коллекции одним массивом float64."""
+        return np.fromiter((node.lon for node in self._nodes.values()), dtype=np.float64, count=len(self._nodes))
+
     def add_node(self, node: Node) -> None:
         """Добавляет узел в коллекцию.
         При добавлении узла с уже существующим ID, он будет перезаписан.
@@ -37,8 +69,9 @@ class NodeCollector:
         if node is None:
             raise ValueError("Узел не может быть None")
         if node.id in self._nodes:
-            logging.warning(f"Узел с ID {node.id} уже существует и будет перезаписан")
+            logging.warning("Узел с ID %d уже существует и будет перезаписан", node.id)
         self._nodes[node.id] = node
+        self._csr = None
 
     def remove_node(self, node_id: int) -> bool:
         """Удаляет узел из коллекции по идентификатору.
@@ -51,12 +84,14 @@ class NodeCollector:
         """
         if node_id in self._nodes:
             del self._nodes[node_id]
+            self._csr = None
             return True
         return False
 
     def clear_nodes(self) -> None:
         """Очищает коллекцию узлов."""
         self._nodes.clear()
+        self._csr = None
 
     def clear_isolated_nodes(self, from_isolated_neighbors: bool = False, from_isolated_ways: bool = False) -> None:
         """Удаляет изолированные узлы из коллекции.
@@ -67,11 +102,102 @@ class NodeCollector:
             Если оба параметра False, удаляет узлы без соседей и путей.
         """
         initial_count = len(self._nodes)
-        if from_isolated_neighbors:
-            self._nodes = {node_id: node for node_id, node in self._nodes.items() if node.is_isolated_neighbors}
-        if from_isolated_ways:
-            self._nodes = {node_id: node for node_id, node in self._nodes.items() if node.is_isolated_ways}
-        if not from_isolated_neighbors and not from_isolated_ways:
-            self._nodes = {node_id: node for node_id, node in self._nodes.items() if not node.is_connected}
+        # Свойства изоляции вычисляются ровно по одному разу на узел в
+        # битовые numpy-массивы; комбинация масок и отбор кандидатов на
+        # удаление выполняются без ветвлений. Ключи удаляем на месте -
+        # без второй копии коллекции в памяти
+        ids = np.fromiter(self._nodes.keys(), dtype=np.int64, count=initial_count)
+        is_isolated_neighbors = np.fromiter(
+            (node.is_isolated_neighbors for node in self._nodes.values()), dtype=bool, count=initial_count
+        )
+        is_isolated_ways = np.fromiter(
+            (node.is_isolated_ways for node in self._nodes.values()), dtype=bool, count=initial_count
+        )
+        if from_isolated_neighbors or from_isolated_ways:
+            mask = np.zeros(initial_count, dtype=bool)
+            if from_isolated_neighbors:
+                mask |= is_isolated_neighbors
+            if from_isolated_ways:
+                mask |= is_isolated_ways
+        else:
+            mask = is_isolated_neighbors & is_isolated_ways
+        for node_id in ids[mask].tolist():
+            del self._nodes[node_id]
         removed_count = initial_count - len(self._nodes)
-        logging.info(f"Удалено изолированных узлов: {removed_count}")
+        if removed_count:
+            self._csr = None
+        logging.info("Удалено изолированных узлов: %d", removed_count)
+
+    def build_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Строит CSR-представление графа соседства узлов.
+
+        Списки соседей упаковываются в один непрерывный массив с указателями
+        строк: массовые обходы (оценка расстояний, экспорт) идут по числовым
+        массивам без погони за указателями по спискам PyObject. Представление
+        кэшируется и пересобирается лениво после мутаций коллекции; связи,
+        измененные напрямую на узлах, подхватываются при следующей пересборке.
+
+        Координаты хранятся в фиксированной точке int32 с шагом
+        1 / COORD_SCALE градуса (~1 см): для ограниченного памятью обхода
+        это вдвое меньше трафика, чем float64. Потребитель переводит их
+        в градусы умножением на 1 / COORD_SCALE.
+
+        Returns:
+            Кортеж (ids, indptr, indices, lats, lons):
+            ids - идентификаторы узлов int64 формы [N] (порядок строк);
+            indptr - указатели строк int64 формы [N+1];
+            indices - номера строк соседей int64 формы [E];
+            lats, lons - координаты узлов int32 формы [N] в фиксированной
+            точке COORD_SCALE.
+        """
+        if self._csr is not None:
+            return self._csr
+
+        n = len(self._nodes)
+        ids = np.fromiter(self._nodes.keys(), dtype=np.int64, count=n)
+        lats = np.round(self.lat_array * COORD_SCALE).astype(np.int32)
+        lons = np.round(self.lon_array * COORD_SCALE).astype(np.int32)
+        row_of = {node_id: row for row, node_id in enumerate(ids.tolist())}
+
+        # Узел мог быть удален из коллекции (например, clear_isolated_nodes),
+        # оставшись в списках соседей выживших узлов - такие висячие ссылки
+        # пропускаются, а indptr считается по фактически упакованным ребрам
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        edge_rows: List[int] = []
+        for row, node in enumerate(self._nodes.values()):
+            for neighbor in node.neighbors:
+                neighbor_row = row_of.get(neighbor.id)
+                if neighbor_row is not None:
+                    edge_rows.append(neighbor_row)
+            indptr[row + 1] = len(edge_rows)
+        indices = np.asarray(edge_rows, dtype=np.int64)
+
+        self._csr = (ids, indptr, indices, lats, lons)
+        return self._csr
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[int]:
+        """Возвращает id k ближайших к точке узлов коллекции.
+
+        Поиск идет по kd-дереву над координатами CSR-представления;
+        дерево строится лениво и пересобирается вместе с CSR после
+        мутаций коллекции. Ранжирование приведенным равнопрямоугольным
+        расстоянием совпадает с гаверсинусом на городских масштабах.
+        Args:
+            lat: Широта точки запроса в градусах
+            lon: Долгота точки запроса в градусах
+            k: Количество ближайших узлов
+        Returns:
+            Список id узлов по возрастанию расстояния (не более k)
+        """
+        if not self._nodes:
+            return []
+        csr = self.build_csr()
+        if self._kdtree is None or self._kdtree_csr is not csr:
+            lats = csr[3] * (1 / COORD_SCALE)
+            lons = csr[4] * (1 / COORD_SCALE)
+            self._kdtree = (build_kd_tree(lats, lons), lats, lons)
+            self._kdtree_csr = csr
+        perm, lats, lons = self._kdtree
+        rows, _ = query_kd_tree(perm, lats, lons, float(lat), float(lon), int(k))
+        ids = csr[0]
+        return [int(ids[row]) for row in rows.tolist() if row >= 0]
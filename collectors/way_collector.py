@@ -1,9 +1,12 @@
 """Модуль для сбора и управления путями OSM."""
 
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
+import numpy as np
 import osmium
+from shapely import STRtree
+from shapely.geometry import box
 
 from ..models.way_model import Way
 
@@ -19,6 +22,10 @@ class WayCollector(osmium.SimpleHandler):
     def __init__(self) -> None:
         super().__init__()
         self._ways: Dict[int, Way] = {}
+        # Ленивый R-tree по ограничивающим прямоугольникам путей;
+        # сбрасывается при любой мутации коллекции
+        self._strtree: Optional[STRtree] = None
+        self._strtree_ids: List[int] = []
 
     def __repr__(self):
         """Возвращает строковое представление объекта WayCollector.
@@ -27,11 +34,41 @@ class WayCollector(osmium.SimpleHandler):
         """
         return f"WayCollector(ways={len(self._ways)}"
 
+    def __getitem__(self, way_id: int) -> Way:
+        """Возвращает путь по id напрямую из словаря, без вызова метода."""
+        return self._ways[way_id]
+
+    def __contains__(self, way_id: int) -> bool:
+        """Проверяет наличие пути с данным id в коллекции."""
+        return way_id in self._ways
+
     @property
     def ways(self) -> Dict[int, Way]:
         """Словарь всех собранных путей, ключ - id пути, значение - объект Way."""
         return self._ways
 
+    @property
+    def lat_array(self) -> np.ndarray:
+        """Опорные широты путей (min/max каждого пути) одним массивом float64.
+        Достаточно для вычисления общего ограничивающего прямоугольника.
+        """
+        return np.fromiter(
+            (lat for way in self._ways.values() for lat in (way.min_lat, way.max_lat)),
+            dtype=np.float64,
+            count=2 * len(self._ways),
+        )
+
+    @property
+    def lon_array(self) -> np.ndarray:
+        """Опорные долготы путей (min/max каждого пути) одним массивом float64.
+        Достаточно для вычисления общего ограничивающего прямоугольника.
+        """
+        return np.fromiter(
+            (lon for way in self._ways.values() for lon in (way.min_lon, way.max_lon)),
+            dtype=np.float64,
+            count=2 * len(self._ways),
+        )
+
     def add_way(self, way: Way) -> None:
         """Добавляет путь в коллекцию.
         При добавлении пути с уже существующим ID, он будет перезаписан.
@@ -43,8 +80,11 @@ class WayCollector(osmium.SimpleHandler):
         if not isinstance(way, Way):
             raise TypeError("way должен быть типа Way")
         if way.id in self._ways:
-            logging.debug(f"Way с id {way.id}уже существует в коллекции. Он будет перезаписан")
+            # Ленивое форматирование: строка собирается только если
+            # уровень DEBUG действительно включен
+            logging.debug("Way с id %d уже существует в коллекции. Он будет перезаписан", way.id)
         self._ways[way.id] = way
+        self._strtree = None
 
     def get_way(self, way_id: int) -> Optional[Way]:
         """Возвращает путь по его идентификатору.
@@ -70,9 +110,15 @@ class WayCollector(osmium.SimpleHandler):
                 node.remove_way(way)
             # Удаляем путь из коллекции
             del self._ways[way_id]
+            self._strtree = None
             return True
         return False
 
+    def clear_ways(self) -> None:
+        """Очищает коллекцию путей."""
+        self._ways.clear()
+        self._strtree = None
+
     def get_ways_by_bounding_box(
         self, min_lat: float, min_lon: float, max_lat: float, max_lon: float
     ) -> Dict[str, Way]:
@@ -85,10 +131,20 @@ class WayCollector(osmium.SimpleHandler):
         Returns:
             Словарь путей, пересекающихся с областью
         """
-        result = {}
-        for way in self._ways.values():
-            if way.min_lat <= max_lat and way.max_lat >= min_lat and way.min_lon <= max_lon and way.max_lon >= min_lon:
-                result[way.id] = way
-        return result
+        if not self._ways:
+            return {}
+        if self._strtree is None:
+            self._build_strtree()
+        # Запрос без предиката проверяет только ограничивающие прямоугольники -
+        # та же семантика, что у прежнего линейного фильтра, но за O(log N)
+        indices = self._strtree.query(box(min_lon, min_lat, max_lon, max_lat))
+        return {self._strtree_ids[i]: self._ways[self._strtree_ids[i]] for i in indices}
+
+    def _build_strtree(self) -> None:
+        """Строит пространственный индекс по ограничивающим прямоугольникам путей."""
+        self._strtree_ids = list(self._ways.keys())
+        self._strtree = STRtree(
+            [box(way.min_lon, way.min_lat, way.max_lon, way.max_lat) for way in self._ways.values()]
+        )
 
     # endregion ways
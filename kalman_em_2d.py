@@ -0,0 +1,252 @@
+"""Модуль с Numba-реализацией фильтра Калмана, RTS-сглаживателя и EM-шага,
+специализированных под двумерное состояние и двумерное наблюдение (H = I).
+Заменяет pykalman в EM_algorithm: устраняет накладные расходы интерпретатора
+на каждом шаге по времени и использует явные формулы обращения матриц 2x2.
+"""
+
+import numpy as np
+from numba import njit
+
+# Логарифм нормировочной константы двумерного нормального распределения
+_LOG_2PI = np.log(2.0 * np.pi)
+
+
+@njit(inline="always")
+def _det2(m00, m01, m10, m11):
+    """Определитель матрицы 2x2 по скалярным элементам."""
+    return m00 * m11 - m01 * m10
+
+
+@njit(inline="always")
+def _inv2(m00, m01, m10, m11, det):
+    """Обращение матрицы 2x2 по скалярным элементам и известному определителю.
+    Returns:
+        Кортеж (i00, i01, i10, i11) элементов обратной матрицы
+    """
+    inv_det = 1.0 / det
+    return m11 * inv_det, -m01 * inv_det, -m10 * inv_det, m00 * inv_det
+
+
+@njit(inline="always")
+def _mul2(a00, a01, a10, a11, b00, b01, b10, b11):
+    """Произведение двух матриц 2x2 по скалярным элементам.
+    Returns:
+        Кортеж (c00, c01, c10, c11) элементов произведения
+    """
+    return (
+        a00 * b00 + a01 * b10,
+        a00 * b01 + a01 * b11,
+        a10 * b00 + a11 * b10,
+        a10 * b01 + a11 * b11,
+    )
+
+
+@njit(cache=True)
+def _forward(data, A, Q, R, x0, P0, reverse=False):
+    """Прямой проход фильтра Калмана для модели x_t = A x_{t-1} + w, y_t = x_t + v.
+    Args:
+        data: Массив наблюдений формы (T, 2)
+        A: Матрица перехода состояния формы (2, 2)
+        Q: Ковариация шума процесса формы (2, 2)
+        R: Ковариация шума наблюдений формы (2, 2)
+        x0: Начальное состояние формы (2,)
+        P0: Ковариация начального состояния формы (2, 2)
+        reverse: Обходить наблюдения в обратном порядке (обратный проход по
+            тому же непрерывному буферу без создания развернутой копии)
+    Returns:
+        Кортеж (filtered_means, filtered_covs, pred_means, pred_covs, loglik):
+        отфильтрованные средние и ковариации, прогнозные средние и ковариации,
+        логарифм правдоподобия по инновациям
+    """
+    n_timesteps = data.shape[0]
+    filtered_means = np.empty((n_timesteps, 2))
+    filtered_covs = np.empty((n_timesteps, 2, 2))
+    pred_means = np.empty((n_timesteps, 2))
+    pred_covs = np.empty((n_timesteps, 2, 2))
+    loglik = 0.0
+
+    pred_means[0] = x0
+    pred_covs[0] = P0
+
+    for t in range(n_timesteps):
+        if t > 0:
+            # Прогноз
+            pred_means[t] = A @ filtered_means[t - 1]
+            pred_covs[t] = A @ filtered_covs[t - 1] @ A.T + Q
+
+        # Инновация (H = I); при reverse наблюдения читаются с конца буфера
+        row = n_timesteps - 1 - t if reverse else t
+        v0 = data[row, 0] - pred_means[t, 0]
+        v1 = data[row, 1] - pred_means[t, 1]
+
+        # S = P_pred + R
+        s00 = pred_covs[t, 0, 0] + R[0, 0]
+        s01 = pred_covs[t, 0, 1] + R[0, 1]
+        s10 = pred_covs[t, 1, 0] + R[1, 0]
+        s11 = pred_covs[t, 1, 1] + R[1, 1]
+
+        # Явное обращение 2x2 вместо np.linalg.inv
+        det = _det2(s00, s01, s10, s11)
+        si00, si01, si10, si11 = _inv2(s00, s01, s10, s11, det)
+
+        loglik += -0.5 * (2.0 * _LOG_2PI + np.log(det)
+                          + v0 * (si00 * v0 + si01 * v1)
+                          + v1 * (si10 * v0 + si11 * v1))
+
+        # Коэффициент усиления K = P_pred @ inv(S)
+        k00 = pred_covs[t, 0, 0] * si00 + pred_covs[t, 0, 1] * si10
+        k01 = pred_covs[t, 0, 0] * si01 + pred_covs[t, 0, 1] * si11
+        k10 = pred_covs[t, 1, 0] * si00 + pred_covs[t, 1, 1] * si10
+        k11 = pred_covs[t, 1, 0] * si01 + pred_covs[t, 1, 1] * si11
+
+        # Коррекция
+        filtered_means[t, 0] = pred_means[t, 0] + k00 * v0 + k01 * v1
+        filtered_means[t, 1] = pred_means[t, 1] + k10 * v0 + k11 * v1
+
+        # P_upd = P_pred - K @ (H @ P_pred): при H = I достаточно вычесть K @ P_pred,
+        # промежуточная матрица (I - K) не материализуется
+        filtered_covs[t, 0, 0] = pred_covs[t, 0, 0] - (k00 * pred_covs[t, 0, 0] + k01 * pred_covs[t, 1, 0])
+        filtered_covs[t, 0, 1] = pred_covs[t, 0, 1] - (k00 * pred_covs[t, 0, 1] + k01 * pred_covs[t, 1, 1])
+        filtered_covs[t, 1, 0] = pred_covs[t, 1, 0] - (k10 * pred_covs[t, 0, 0] + k11 * pred_covs[t, 1, 0])
+        filtered_covs[t, 1, 1] = pred_covs[t, 1, 1] - (k10 * pred_covs[t, 0, 1] + k11 * pred_covs[t, 1, 1])
+
+    return filtered_means, filtered_covs, pred_means, pred_covs, loglik
+
+
+@njit(cache=True)
+def _rts_smooth(A, filtered_means, filtered_covs, pred_means, pred_covs):
+    """Сглаживатель Рауха-Тунга-Стрибеля (RTS) по результатам прямого прохода.
+    Args:
+        A: Матрица перехода состояния формы (2, 2)
+        filtered_means: Отфильтрованные средние формы (T, 2)
+        filtered_covs: Отфильтрованные ковариации формы (T, 2, 2)
+        pred_means: Прогнозные средние формы (T, 2)
+        pred_covs: Прогнозные ковариации формы (T, 2, 2)
+    Returns:
+        Кортеж (smoothed_means, smoothed_covs, lag_one_covs): сглаженные средние,
+        ковариации и ковариации соседних состояний Cov(x_t, x_{t-1} | y_1:T)
+        (элемент lag_one_covs[0] не используется)
+    """
+    n_timesteps = filtered_means.shape[0]
+    smoothed_means = np.empty((n_timesteps, 2))
+    smoothed_covs = np.empty((n_timesteps, 2, 2))
+    lag_one_covs = np.zeros((n_timesteps, 2, 2))
+
+    smoothed_means[n_timesteps - 1] = filtered_means[n_timesteps - 1]
+    smoothed_covs[n_timesteps - 1] = filtered_covs[n_timesteps - 1]
+
+    a00 = A[0, 0]
+    a01 = A[0, 1]
+    a10 = A[1, 0]
+    a11 = A[1, 1]
+
+    for t in range(n_timesteps - 2, -1, -1):
+        # Явное обращение прогнозной ковариации P_pred[t+1]
+        p00 = pred_covs[t + 1, 0, 0]
+        p01 = pred_covs[t + 1, 0, 1]
+        p10 = pred_covs[t + 1, 1, 0]
+        p11 = pred_covs[t + 1, 1, 1]
+        pi00, pi01, pi10, pi11 = _inv2(p00, p01, p10, p11, _det2(p00, p01, p10, p11))
+
+        # Сглаживающий коэффициент J_t = P_f[t] @ A.T @ inv(P_pred[t+1])
+        t00, t01, t10, t11 = _mul2(a00, a10, a01, a11, pi00, pi01, pi10, pi11)
+        j00, j01, j10, j11 = _mul2(
+            filtered_covs[t, 0, 0], filtered_covs[t, 0, 1],
+            filtered_covs[t, 1, 0], filtered_covs[t, 1, 1],
+            t00, t01, t10, t11,
+        )
+
+        d0 = smoothed_means[t + 1, 0] - pred_means[t + 1, 0]
+        d1 = smoothed_means[t + 1, 1] - pred_means[t + 1, 1]
+        smoothed_means[t, 0] = filtered_means[t, 0] + j00 * d0 + j01 * d1
+        smoothed_means[t, 1] = filtered_means[t, 1] + j10 * d0 + j11 * d1
+
+        # P_s[t] = P_f[t] + J (P_s[t+1] - P_pred[t+1]) J^T
+        c00 = smoothed_covs[t + 1, 0, 0] - pred_covs[t + 1, 0, 0]
+        c01 = smoothed_covs[t + 1, 0, 1] - pred_covs[t + 1, 0, 1]
+        c10 = smoothed_covs[t + 1, 1, 0] - pred_covs[t + 1, 1, 0]
+        c11 = smoothed_covs[t + 1, 1, 1] - pred_covs[t + 1, 1, 1]
+        jc00, jc01, jc10, jc11 = _mul2(j00, j01, j10, j11, c00, c01, c10, c11)
+        r00, r01, r10, r11 = _mul2(jc00, jc01, jc10, jc11, j00, j10, j01, j11)
+        smoothed_covs[t, 0, 0] = filtered_covs[t, 0, 0] + r00
+        smoothed_covs[t, 0, 1] = filtered_covs[t, 0, 1] + r01
+        smoothed_covs[t, 1, 0] = filtered_covs[t, 1, 0] + r10
+        smoothed_covs[t, 1, 1] = filtered_covs[t, 1, 1] + r11
+
+        # Cov(x_{t+1}, x_t | y_1:T) = P_s[t+1] @ J^T
+        lag_one_covs[t + 1, 0, 0], lag_one_covs[t + 1, 0, 1], lag_one_covs[t + 1, 1, 0], lag_one_covs[t + 1, 1, 1] = _mul2(
+            smoothed_covs[t + 1, 0, 0], smoothed_covs[t + 1, 0, 1],
+            smoothed_covs[t + 1, 1, 0], smoothed_covs[t + 1, 1, 1],
+            j00, j10, j01, j11,
+        )
+
+    return smoothed_means, smoothed_covs, lag_one_covs
+
+
+@njit(cache=True)
+def _em_update(data, smoothed_means, smoothed_covs, lag_one_covs, reverse=False):
+    """M-шаг EM-алгоритма: замкнутые формулы для A, Q, R через достаточные статистики.
+    Args:
+        data: Массив наблюдений формы (T, 2)
+        smoothed_means: Сглаженные средние формы (T, 2)
+        smoothed_covs: Сглаженные ковариации формы (T, 2, 2)
+        lag_one_covs: Ковариации соседних состояний формы (T, 2, 2)
+        reverse: Наблюдения соответствуют обратному обходу буфера data
+    Returns:
+        Кортеж (A_new, Q_new, R_new) с обновленными матрицами модели
+    """
+    n_timesteps = data.shape[0]
+
+    # Достаточные статистики: S11 = sum x_t x_t^T, S10 = sum x_t x_{t-1}^T,
+    # S00 = sum x_{t-1} x_{t-1}^T (суммы по t = 1..T-1 с учетом ковариаций).
+    # Накопление ведется в скалярах - без выделения временных матриц np.outer
+    s11_00 = 0.0; s11_01 = 0.0; s11_10 = 0.0; s11_11 = 0.0
+    s10_00 = 0.0; s10_01 = 0.0; s10_10 = 0.0; s10_11 = 0.0
+    s00_00 = 0.0; s00_01 = 0.0; s00_10 = 0.0; s00_11 = 0.0
+    for t in range(1, n_timesteps):
+        m0 = smoothed_means[t, 0]
+        m1 = smoothed_means[t, 1]
+        p0 = smoothed_means[t - 1, 0]
+        p1 = smoothed_means[t - 1, 1]
+
+        s11_00 += smoothed_covs[t, 0, 0] + m0 * m0
+        s11_01 += smoothed_covs[t, 0, 1] + m0 * m1
+        s11_10 += smoothed_covs[t, 1, 0] + m1 * m0
+        s11_11 += smoothed_covs[t, 1, 1] + m1 * m1
+
+        s10_00 += lag_one_covs[t, 0, 0] + m0 * p0
+        s10_01 += lag_one_covs[t, 0, 1] + m0 * p1
+        s10_10 += lag_one_covs[t, 1, 0] + m1 * p0
+        s10_11 += lag_one_covs[t, 1, 1] + m1 * p1
+
+        s00_00 += smoothed_covs[t - 1, 0, 0] + p0 * p0
+        s00_01 += smoothed_covs[t - 1, 0, 1] + p0 * p1
+        s00_10 += smoothed_covs[t - 1, 1, 0] + p1 * p0
+        s00_11 += smoothed_covs[t - 1, 1, 1] + p1 * p1
+
+    s11 = np.array(((s11_00, s11_01), (s11_10, s11_11)))
+    s10 = np.array(((s10_00, s10_01), (s10_10, s10_11)))
+
+    # A_new = S10 @ inv(S00), обращение 2x2 явно
+    si00, si01, si10, si11 = _inv2(s00_00, s00_01, s00_10, s00_11,
+                                   _det2(s00_00, s00_01, s00_10, s00_11))
+    an00, an01, an10, an11 = _mul2(s10_00, s10_01, s10_10, s10_11, si00, si01, si10, si11)
+    a_new = np.array(((an00, an01), (an10, an11)))
+
+    q_new = (s11 - a_new @ s10.T) / (n_timesteps - 1)
+    # Симметризация для устойчивости к ошибкам округления
+    q_new = 0.5 * (q_new + q_new.T)
+
+    # R_new = (1/T) sum (y_t - x_t)(y_t - x_t)^T + P_t (H = I),
+    # также через скалярные аккумуляторы
+    r00 = 0.0; r01 = 0.0; r11 = 0.0
+    for t in range(n_timesteps):
+        row = n_timesteps - 1 - t if reverse else t
+        e0 = data[row, 0] - smoothed_means[t, 0]
+        e1 = data[row, 1] - smoothed_means[t, 1]
+        r00 += e0 * e0 + smoothed_covs[t, 0, 0]
+        r01 += e0 * e1 + 0.5 * (smoothed_covs[t, 0, 1] + smoothed_covs[t, 1, 0])
+        r11 += e1 * e1 + smoothed_covs[t, 1, 1]
+    r_new = np.array(((r00, r01), (r01, r11))) / n_timesteps
+
+    return a_new, q_new, r_new
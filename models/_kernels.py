@@ -0,0 +1,69 @@
+"""Числовые ядра для работы с кэшем координат модели Way.
+
+Функции скомпилированы Numba в машинный код: границы и центр пути
+считаются по непрерывному массиву (n, 2) без питоновской арифметики
+над боксированными float.
+"""
+
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def bbox(coords):
+    """Считает границы по массиву координат формы (n, 2) в порядке (lat, lon).
+
+    Args:
+        coords: Массив координат float64 формы (n, 2)
+
+    Returns:
+        Кортеж (min_lat, min_lon, max_lat, max_lon)
+    """
+    min_lat = coords[0, 0]
+    max_lat = coords[0, 0]
+    min_lon = coords[0, 1]
+    max_lon = coords[0, 1]
+    for i in range(1, coords.shape[0]):
+        lat = coords[i, 0]
+        lon = coords[i, 1]
+        min_lat = min(min_lat, lat)
+        max_lat = max(max_lat, lat)
+        min_lon = min(min_lon, lon)
+        max_lon = max(max_lon, lon)
+    return min_lat, min_lon, max_lat, max_lon
+
+
+@njit(cache=True, fastmath=True)
+def update_bbox(min_lat, max_lat, min_lon, max_lon, lat, lon):
+    """Расширяет границы новой точкой без ветвлений в Python.
+
+    Args:
+        min_lat: Текущая минимальная широта
+        max_lat: Текущая максимальная широта
+        min_lon: Текущая минимальная долгота
+        max_lon: Текущая максимальная долгота
+        lat: Широта новой точки
+        lon: Долгота новой точки
+
+    Returns:
+        Кортеж (min_lat, max_lat, min_lon, max_lon) с учетом новой точки
+    """
+    return min(min_lat, lat), max(max_lat, lat), min(min_lon, lon), max(max_lon, lon)
+
+
+@njit(cache=True, fastmath=True)
+def center(coords):
+    """Считает центр (средние координаты) по массиву формы (n, 2).
+
+    Args:
+        coords: Массив координат float64 формы (n, 2)
+
+    Returns:
+        Кортеж (center_lat, center_lon)
+    """
+    sum_lat = 0.0
+    sum_lon = 0.0
+    n = coords.shape[0]
+    for i in range(n):
+        sum_lat += coords[i, 0]
+        sum_lon += coords[i, 1]
+    return sum_lat / n, sum_lon / n
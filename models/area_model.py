@@ -6,7 +6,9 @@ from typing import (
     Optional,
 )
 
-from shapely.geometry import Point, Polygon
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
 
 from ..models.node_model import Node
 
@@ -53,6 +55,13 @@ class Area:
         self._min_lat: Optional[float] = min_lat
         self._max_lat: Optional[float] = max_lat
 
+        # Кэш координат границ в виде массивов (N, 2) (долгота, широта):
+        # непрерывная память для векторных редукций и передачи в shapely без копий
+        self._outer_coords: Optional[np.ndarray] = None
+        self._inner_coords: Optional[List[np.ndarray]] = None
+        # Кэш полигонов внутренних границ для contains_point
+        self._inner_shapely_polygons: Optional[List[Polygon]] = None
+
         if outer_border or inner_borders:
             self._calculate_bounding_box()
 
@@ -99,6 +108,7 @@ class Area:
         if not isinstance(new_outer_border, list) or not all(isinstance(node, Node) for node in new_outer_border):
             raise ValueError("Outer border должен быть списком объектов Node")
         self._outer_border = new_outer_border
+        self._invalidate_coords()
 
     @property
     def inner_borders(self) -> List[List[Node]]:
@@ -112,6 +122,38 @@ class Area:
         ):
             raise ValueError("Inner borders должен быть списком списков объектов Node")
         self._inner_borders = new_inner_borders
+        self._invalidate_coords()
+
+    @property
+    def outer_coords(self) -> np.ndarray:
+        """Координаты внешней границы в виде массива (N, 2) (долгота, широта).
+        Массив строится лениво и кэшируется до изменения границ.
+        """
+        if self._outer_coords is None:
+            self._outer_coords = np.array(
+                [(node.lon, node.lat) for node in self._outer_border],
+                dtype=np.float64,
+            ).reshape(-1, 2)
+        return self._outer_coords
+
+    @property
+    def inner_coords(self) -> List[np.ndarray]:
+        """Координаты внутренних границ в виде списка массивов (N, 2) (долгота, широта).
+        Массивы строятся лениво и кэшируются до изменения границ.
+        """
+        if self._inner_coords is None:
+            self._inner_coords = [
+                np.array([(node.lon, node.lat) for node in border], dtype=np.float64).reshape(-1, 2)
+                for border in self._inner_borders
+            ]
+        return self._inner_coords
+
+    def _invalidate_coords(self) -> None:
+        """Сбрасывает кэш массивов координат и полигонов после изменения границ."""
+        self._outer_coords = None
+        self._inner_coords = None
+        self._shapely_polygon = None
+        self._inner_shapely_polygons = None
 
     @property
     def bounding_box(self) -> Optional[List[float]]:
@@ -144,17 +186,18 @@ class Area:
 
     def _calculate_bounding_box(self) -> None:
         """Вычисляет ограничивающий прямоугольник области на основе границ."""
-        for border in [self._outer_border] + self._inner_borders:
-            for node in border:
-                lat, lon = node.coordinates
-                if self._min_lat is None or lat < self._min_lat:
-                    self._min_lat = lat
-                if self._max_lat is None or lat > self._max_lat:
-                    self._max_lat = lat
-                if self._min_lon is None or lon < self._min_lon:
-                    self._min_lon = lon
-                if self._max_lon is None or lon > self._max_lon:
-                    self._max_lon = lon
+        arrays = [self.outer_coords] + self.inner_coords
+        arrays = [arr for arr in arrays if arr.size > 0]
+        if not arrays:
+            return
+        min_lon = min(float(arr[:, 0].min()) for arr in arrays)
+        max_lon = max(float(arr[:, 0].max()) for arr in arrays)
+        min_lat = min(float(arr[:, 1].min()) for arr in arrays)
+        max_lat = max(float(arr[:, 1].max()) for arr in arrays)
+        self._min_lat = min_lat if self._min_lat is None else min(self._min_lat, min_lat)
+        self._max_lat = max_lat if self._max_lat is None else max(self._max_lat, max_lat)
+        self._min_lon = min_lon if self._min_lon is None else min(self._min_lon, min_lon)
+        self._max_lon = max_lon if self._max_lon is None else max(self._max_lon, max_lon)
 
     @property
     def shapely_polygon(self) -> Optional[Polygon]:
@@ -234,6 +277,7 @@ class Area:
         if not isinstance(border, list) or not all(isinstance(node, Node) for node in border):
             raise ValueError("Outer border должен быть списком объектов Node")
         self._outer_border = border
+        self._invalidate_coords()
         self._calculate_bounding_box()
 
     def remove_outer_border(self) -> None:
@@ -244,6 +288,7 @@ class Area:
         if self._inner_borders:
             raise ValueError("Нельзя удалить внешнюю границу, если есть внутренние границы")
         self._outer_border = []
+        self._invalidate_coords()
         self._min_lon = self._max_lon = self._min_lat = self._max_lat = None
 
     def add_inner_border(self, border: List[Node]) -> None:
@@ -259,6 +304,7 @@ class Area:
         if not self._outer_border:
             raise ValueError("Нельзя добавить внутреннюю границу без внешней границы")
         self._inner_borders.append(border)
+        self._invalidate_coords()
 
     def remove_inner_border(self, border: List[Node]) -> bool:
         """Удаляет внутреннюю границу области.
@@ -269,6 +315,7 @@ class Area:
         """
         try:
             self._inner_borders.remove(border)
+            self._invalidate_coords()
             self._min_lon = self._max_lon = self._min_lat = self._max_lat = None
             return True
         except ValueError:
@@ -277,6 +324,7 @@ class Area:
     def clear_inner_borders(self) -> None:
         """Удаляет все внутренние границы области."""
         self._inner_borders.clear()
+        self._invalidate_coords()
         self._min_lon = self._max_lon = self._min_lat = self._max_lat = None
 
     # endregion
@@ -294,12 +342,75 @@ class Area:
         Raises:
             ValueError: Если внешняя граница не установлена
         """
-        polygon = Polygon([(node.lon, node.lat) for node in self._outer_border])
-        point = Point(lon, lat)
-        if not polygon.contains(point):
+        self._ensure_polygons()
+        if not bool(shapely.contains_xy(self._shapely_polygon, lon, lat)):
             return False
-        for inner_border in self._inner_borders:
-            inner_polygon = Polygon([(node.lon, node.lat) for node in inner_border])
-            if inner_polygon.contains(point):
+        for inner_polygon in self._inner_shapely_polygons:
+            if bool(shapely.contains_xy(inner_polygon, lon, lat)):
                 return False
         return True
+
+    def contains_points(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Векторная проверка принадлежности набора точек области.
+        Точка считается внутри области, если она находится внутри внешней границы
+        и вне всех внутренних границ.
+        Args:
+            lats: Массив широт точек
+            lons: Массив долгот точек
+        Returns:
+            Булев массив той же длины, что и входные координаты
+        """
+        self._ensure_polygons()
+        result = shapely.contains_xy(self._shapely_polygon, lons, lats)
+        for inner_polygon in self._inner_shapely_polygons:
+            result &= ~shapely.contains_xy(inner_polygon, lons, lats)
+        return result
+
+    def _ensure_polygons(self) -> None:
+        """Лениво строит и подготавливает (shapely.prepare) полигоны границ."""
+        if self._shapely_polygon is None:
+            self._shapely_polygon = Polygon(self.outer_coords)
+            # Предвычисленный индекс ребер ускоряет точечные запросы на порядки
+            shapely.prepare(self._shapely_polygon)
+        if self._inner_shapely_polygons is None:
+            self._inner_shapely_polygons = [Polygon(coords) for coords in self.inner_coords]
+            for inner_polygon in self._inner_shapely_polygons:
+                shapely.prepare(inner_polygon)
+
+
+def build_area_polygons(areas: List[Area]) -> None:
+    """Массово строит shapely-полигоны для списка областей.
+    Внешние границы всех областей без внутренних колец объединяются в один
+    массив координат и передаются пакетным конструкторам shapely 2.0
+    (shapely.linearrings / shapely.polygons), что избегает поштучного
+    создания полигонов из Python. Области с внутренними кольцами строятся
+    поштучно обычным путем.
+    Args:
+        areas: Список областей, которым нужно построить полигоны
+    """
+    simple_areas = []
+    for area in areas:
+        if area._shapely_polygon is not None:  # pylint: disable=protected-access
+            continue
+        if area.inner_borders or len(area.outer_border) < 3:
+            # Полигоны с внутренними кольцами или вырожденные строим поштучно
+            if area.outer_border:
+                area._ensure_polygons()  # pylint: disable=protected-access
+            continue
+        simple_areas.append(area)
+
+    if not simple_areas:
+        return
+
+    coords = np.concatenate([area.outer_coords for area in simple_areas])
+    indices = np.repeat(
+        np.arange(len(simple_areas)),
+        [len(area.outer_coords) for area in simple_areas],
+    )
+    rings = shapely.linearrings(coords, indices=indices)
+    polygons = shapely.polygons(rings)
+
+    for area, polygon in zip(simple_areas, polygons):
+        shapely.prepare(polygon)
+        area._shapely_polygon = polygon  # pylint: disable=protected-access
+        area._inner_shapely_polygons = []  # pylint: disable=protected-access
@@ -29,6 +29,20 @@ class Node:
         _neighbors: Список соседних узлов для построения графа связей.
     """
 
+    # Узлов создаются миллионы: __slots__ убирает per-instance __dict__
+    # и ускоряет доступ к атрибутам
+    __slots__ = (
+        "_id",
+        "_lat",
+        "_lon",
+        "_ways",
+        "_areas",
+        "_neighbors",
+        "_way_ids",
+        "_area_ids",
+        "_neighbor_ids",
+    )
+
     def __init__(
         self,
         node_id: int,
@@ -52,14 +66,53 @@ class Node:
         self._ways = list(ways) if ways else []
         self._areas = list(areas) if areas else []
         self._neighbors: List["Node"] = []
+        # Параллельные множества id: принадлежность за O(1) вместо
+        # линейного поиска по спискам при каждой вставке
+        self._way_ids = {way.id for way in self._ways}
+        self._area_ids = {area.id for area in self._areas}
+        self._neighbor_ids: set = set()
+
+    @classmethod
+    def batch_create(cls, ids: List[int], lats: List[float], lons: List[float]) -> List["Node"]:
+        """Создает список узлов пачкой, минуя __init__.
+
+        Координаты считаются уже провалидированными источником (например,
+        файлом, записанным write_geojson): без разбора именованных
+        аргументов и проверки диапазонов на каждый узел - это заметно
+        при создании миллионов узлов.
+        Args:
+            ids: Идентификаторы узлов
+            lats: Широты узлов в градусах
+            lons: Долготы узлов в градусах
+        Returns:
+            Список объектов Node в порядке входных массивов
+        """
+        nodes: List["Node"] = []
+        append = nodes.append
+        new = cls.__new__
+        for node_id, lat, lon in zip(ids, lats, lons):
+            node = new(cls)
+            node._id = node_id
+            node._lat = lat
+            node._lon = lon
+            node._ways = []
+            node._areas = []
+            node._neighbors = []
+            node._way_ids = set()
+            node._area_ids = set()
+            node._neighbor_ids = set()
+            append(node)
+        return nodes
 
     def __hash__(self) -> int:
         return hash(self._id)
 
     def __eq__(self, other: Node) -> bool:
-        if not isinstance(other, Node):
-            return False
-        return self._id == other.id
+        # Быстрый путь по идентичности: id узлов уникальны в рамках сессии,
+        # так что совпадающие объекты почти всегда один и тот же экземпляр
+        if self is other:
+            return True
+        return type(other) is Node and self._id == other._id
 
     @staticmethod
     def _validate_coordinates(lat: float, lon: float) -> Tuple[float, float]:
@@ -79,6 +132,10 @@ class Node:
         return lat, lon
 
     def __repr__(self) -> str:
+        # Узел, созданный без координат, не имеет слотов _lat/_lon -
+        # repr не должен падать в отладочном логе
+        if getattr(self, "_lat", None) is None:
+            return f"Node(id={self._id}, coords=unset, ways={self.way_count}, neighbors={self.neighbor_count})"
         return (
             f"Node(id={self._id}, coords=({self._lat:.4f}, {self._lon:.4f}), "
             f"ways={self.way_count}, neighbors={self.neighbor_count})"
@@ -140,7 +197,8 @@ class Node:
         """
         if way is None:
             raise ValueError("Путь не может быть None")
-        if way not in self._ways:
+        if way.id not in self._way_ids:
+            self._way_ids.add(way.id)
             self._ways.append(way)
 
     def remove_way(self, way: "Way") -> bool:
@@ -152,6 +210,7 @@ class Node:
         """
         try:
             self._ways.remove(way)
+            self._way_ids.discard(way.id)
             return True
         except ValueError:
             return False
@@ -159,6 +218,7 @@ class Node:
     def clear_ways(self) -> None:
         """Удаляет все пути узла."""
         self._ways.clear()
+        self._way_ids.clear()
 
     @property
     def way_count(self) -> int:
@@ -176,7 +236,8 @@ class Node:
         """
         if area is None:
             raise ValueError("Область не может быть None")
-        if area not in self._areas:
+        if area.id not in self._area_ids:
+            self._area_ids.add(area.id)
             self._areas.append(area)
 
     # region Методы работы с соседями
@@ -191,7 +252,8 @@ class Node:
             raise ValueError("Сосед не может быть None")
         if neighbor is self:
             raise ValueError("Узел не может быть соседом самому себе")
-        if neighbor not in self._neighbors:
+        if neighbor.id not in self._neighbor_ids:
+            self._neighbor_ids.add(neighbor.id)
             self._neighbors.append(neighbor)
             # Добавляем обратную связь
             neighbor.add_neighbor(self)
@@ -205,6 +267,7 @@ class Node:
         """
         try:
             self._neighbors.remove(neighbor)
+            self._neighbor_ids.discard(neighbor.id)
             # Удаляем обратную связь
             neighbor.remove_neighbor(self)
             return True
@@ -212,9 +275,24 @@ class Node:
             return False
 
     def clear_neighbors(self) -> None:
-        """Удаляет всех соседей узла."""
-        for neighbor in self._neighbors:
-            self.remove_neighbor(neighbor)
+        """Удаляет всех соседей узла.
+
+        Список соседей забирается целиком до очистки: прежний обход
+        вызывал remove_neighbor, который мутировал тот же список на ходу,
+        пропуская каждого второго соседа, и стоил O(d^2).
+        """
+        peers = self._neighbors
+        self._neighbors = []
+        self._neighbor_ids.clear()
+        for peer in peers:
+            # Снимаем обратную связь напрямую, без рекурсивного
+            # remove_neighbor
+            try:
+                peer._neighbors.remove(self)
+            except ValueError:
+                pass
+            else:
+                peer._neighbor_ids.discard(self._id)
 
     @property
     def neighbor_count(self) -> int:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
 from typing import (
     TYPE_CHECKING,
     Dict,
@@ -14,6 +15,8 @@ from typing import (
 import numpy as np
 from shapely.geometry import LineString
 
+from ..models import _kernels
+
 if TYPE_CHECKING:
     from node_model import Node
 
@@ -34,8 +37,29 @@ class Way:
         _max_lat: Максимальная широта узлов пути.
         _min_lon: Минимальная долгота узлов пути.
         _max_lon: Максимальная долгота узлов пути.
+        _coords: Кэшированный массив координат узлов формы (n, 2) в порядке (lat, lon).
     """
 
+    # Путей создаются сотни тысяч: __slots__ убирает per-instance __dict__
+    # и ускоряет доступ к атрибутам
+    __slots__ = (
+        "_id",
+        "_tags",
+        "_nodes",
+        "_is_polygon",
+        "_min_lat",
+        "_max_lat",
+        "_min_lon",
+        "_max_lon",
+        "_neighbor_ways",
+        "_shapely_line",
+        "_coords_buf",
+        "_n_coords",
+        "_node_set",
+        "_hash",
+        "_ids",
+    )
+
     def __init__(
         self,
         way_id: int,
@@ -58,28 +82,94 @@ class Way:
             ValueError: Если идентификатор некорректен
         """
         self._id: int = way_id
+        # Хэш считается один раз: пути постоянно служат ключами
+        # в словарях _neighbor_ways
+        self._hash: int = hash(way_id)
         self._tags: Dict[str, str] = tags if tags else {}
         self._nodes: List["Node"] = list(nodes) if nodes else []
-        self._is_polygon: bool = False
+        self._is_polygon: bool = len(self._nodes) >= 2 and self._nodes[0] is self._nodes[-1]
         self._min_lat: Optional[float] = min_lat
         self._max_lat: Optional[float] = max_lat
         self._min_lon: Optional[float] = min_lon
         self._max_lon: Optional[float] = max_lon
         self._neighbor_ways: Dict[Way, List[Node]] = {}
         self._shapely_line: Optional[LineString] = shapely_line
+        # Хэш-индекс узлов: проверки принадлежности за O(1) вместо
+        # линейного поиска по списку
+        self._node_set: Optional[set] = set(self._nodes)
+
+        # Кэш координат: буфер с амортизированным удвоением емкости,
+        # _n_coords - фактическое число заполненных строк
+        self._coords_buf: np.ndarray = np.empty((0, 2), dtype=np.float64)
+        self._n_coords: int = 0
+        # Идентификаторы узлов для путей, созданных из SoA-массивов
+        self._ids: Optional[np.ndarray] = None
 
         if self._nodes:
             # Обновляем связи с узлами
             for node in self._nodes:
                 node.add_way(self)
 
-            lats = [node.coordinates[0] for node in self._nodes]
-            lons = [node.coordinates[1] for node in self._nodes]
+            self._coords_buf = np.array([node.coordinates for node in self._nodes], dtype=np.float64)
+            self._n_coords = len(self._nodes)
+
+        if shapely_line is not None:
+            # Границы уже посчитаны C-кодом Shapely - питоновский пересчет не нужен
+            self._min_lon, self._min_lat, self._max_lon, self._max_lat = shapely_line.bounds
+        elif self._nodes:
+            self._recalculate_bounds()
+
+    @classmethod
+    def from_soa(
+        cls,
+        way_id: int,
+        tags: Optional[Dict[str, str]] = None,
+        ids: Optional[np.ndarray] = None,
+        lats: Optional[np.ndarray] = None,
+        lons: Optional[np.ndarray] = None,
+    ) -> "Way":
+        """Создает путь напрямую из SoA-массивов парсера без объектов Node.
+
+        Координаты кладутся в кэш одним куском, границы считаются одним
+        векторным проходом - ни одного обращения к атрибутам Node.
+        Список _nodes остается пустым: узлы при необходимости разрешаются
+        по _ids из общей таблицы узлов.
+
+        Args:
+            way_id: Уникальный идентификатор пути
+            tags: Словарь тегов с метаданными пути
+            ids: Идентификаторы узлов пути
+            lats: Широты узлов пути
+            lons: Долготы узлов пути
+
+        Returns:
+            Новый объект Way с заполненным кэшем координат
+        """
+        way = cls(way_id, tags=tags)
+        if ids is not None:
+            way._ids = np.ascontiguousarray(ids, dtype=np.int64)
+        if lats is not None and lons is not None:
+            way._coords_buf = np.column_stack((
+                np.asarray(lats, dtype=np.float64),
+                np.asarray(lons, dtype=np.float64),
+            ))
+            way._n_coords = len(way._coords_buf)
+            way._recalculate_bounds()
+        if way._ids is not None and len(way._ids) >= 2:
+            way._is_polygon = bool(way._ids[0] == way._ids[-1])
+        return way
+
+    @property
+    def _coords(self) -> np.ndarray:
+        """Заполненная часть кэша координат формы (n, 2) без копирования."""
+        return self._coords_buf[:self._n_coords]
 
-            self._min_lat = min(lats)
-            self._min_lon = min(lons)
-            self._max_lat = max(lats)
-            self._max_lon = max(lons)
+    def _recalculate_bounds(self) -> None:
+        """Пересчитывает границы пути одним векторным проходом по кэшу координат."""
+        if self._n_coords == 0:
+            self._min_lat = self._max_lat = self._min_lon = self._max_lon = None
+            return
+        self._min_lat, self._min_lon, self._max_lat, self._max_lon = _kernels.bbox(self._coords)
 
     def __repr__(self) -> str:
         """Возвращает строковое представление объекта Way."""
@@ -88,12 +178,30 @@ class Way:
         )
 
     def __hash__(self) -> int:
-        return hash(self._id)
+        return self._hash
 
     def __eq__(self, other: Way) -> bool:
-        if not isinstance(other, Way):
-            return False
-        return self._id == other.id
+        return self is other or (type(other) is Way and self._id == other._id)
+
+    def __getstate__(self) -> dict:
+        """Состояние для pickle без хэш-индекса узлов.
+
+        При восстановлении циклических ссылок (узел -> путь -> узел)
+        узлы еще не заполнены и не могут хэшироваться, поэтому индекс
+        пересобирается лениво после распаковки.
+        """
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != "_node_set"}
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._node_set = None
+
+    def _nodes_index(self) -> set:
+        """Хэш-индекс узлов с ленивой пересборкой после unpickle."""
+        if self._node_set is None:
+            self._node_set = set(self._nodes)
+        return self._node_set
 
     @property
     def id(self) -> int:
@@ -113,7 +221,7 @@ class Way:
     @property
     def is_polygon(self) -> bool:
         """Проверяет, является ли путь полигоном (замкнутым)."""
-        return len(self._nodes) >= 2 and self._nodes[0] == self._nodes[-1]
+        return self._is_polygon
 
     @property
     def min_lat(self) -> Union[float, None]:
@@ -236,19 +344,29 @@ class Way:
             raise ValueError("Узел не может быть None")
 
         self._nodes.append(node)
+        self._nodes_index().add(node)
         node.add_way(self)
 
         if len(self._nodes) >= 2 and self._nodes[0] == self._nodes[-1]:
             self._is_polygon = True
 
-        if self._min_lat is None or node.coordinates[0] < self._min_lat:
-            self._min_lat = node.coordinates[0]
-        if self._max_lat is None or node.coordinates[0] > self._max_lat:
-            self._max_lat = node.coordinates[0]
-        if self._min_lon is None or node.coordinates[1] < self._min_lon:
-            self._min_lon = node.coordinates[1]
-        if self._max_lon is None or node.coordinates[1] > self._max_lon:
-            self._max_lon = node.coordinates[1]
+        # Дозапись в кэш координат с удвоением емкости при переполнении
+        if self._n_coords == len(self._coords_buf):
+            new_buf = np.empty((max(4, 2 * len(self._coords_buf)), 2), dtype=np.float64)
+            new_buf[:self._n_coords] = self._coords_buf[:self._n_coords]
+            self._coords_buf = new_buf
+        lat, lon = node.coordinates
+        self._coords_buf[self._n_coords, 0] = lat
+        self._coords_buf[self._n_coords, 1] = lon
+        self._n_coords += 1
+
+        if self._min_lat is None:
+            self._min_lat = self._max_lat = lat
+            self._min_lon = self._max_lon = lon
+        else:
+            self._min_lat, self._max_lat, self._min_lon, self._max_lon = _kernels.update_bbox(
+                self._min_lat, self._max_lat, self._min_lon, self._max_lon, lat, lon
+            )
 
     def remove_node(self, node: "Node") -> bool:
         """Удаляет узел из пути.
@@ -260,25 +378,38 @@ class Way:
             True если узел был удален, иначе False
         """
         try:
-            node.remove_way(self)
-            self._nodes.remove(node)
-
-            lats = [node.coordinates[0] for node in self._nodes]
-            lons = [node.coordinates[1] for node in self._nodes]
-
-            self._min_lat = min(lats)
-            self._min_lon = min(lons)
-            self._max_lat = max(lats)
-            self._max_lon = max(lons)
-
-            return True
+            index = self._nodes.index(node)
         except ValueError:
             return False
+        node.remove_way(self)
+        del self._nodes[index]
+        # Замыкающий узел полигона входит в список дважды - из индекса
+        # удаляем только если узел больше не встречается
+        if node not in self._nodes:
+            self._nodes_index().discard(node)
+
+        self._coords_buf = np.delete(self._coords, index, axis=0)
+        self._n_coords -= 1
+        self._recalculate_bounds()
+        # Узлы разделяются между путями, поэтому замкнутость проверяется
+        # сравнением идентичности концов
+        self._is_polygon = len(self._nodes) >= 2 and self._nodes[0] is self._nodes[-1]
+
+        return True
 
     def clear_nodes(self) -> None:
         """Удаляет все узлы из пути."""
+        # Один линейный проход: прежний цикл по remove_node мутировал список
+        # во время итерации (пропуская элементы) и пересчитывал границы на
+        # каждом шаге
         for node in self._nodes:
-            self.remove_node(node)
+            node.remove_way(self)
+        self._nodes.clear()
+        self._nodes_index().clear()
+        self._coords_buf = np.empty((0, 2), dtype=np.float64)
+        self._n_coords = 0
+        self._min_lat = self._max_lat = self._min_lon = self._max_lon = None
+        self._is_polygon = False
 
     @property
     def node_count(self) -> int:
@@ -302,7 +433,7 @@ class Way:
         Returns:
             True если узел содержится в пути, иначе False
         """
-        return node in self._nodes
+        return node in self._nodes_index()
 
     def add_neighbor_way(self, way: "Way", shared_node: "Node") -> None:
         """Добавляет соседний путь с общим узлом.
@@ -318,31 +449,69 @@ class Way:
             raise ValueError("Путь и узел не могут быть None")
         if way.id == self.id:
             raise ValueError("Путь не может быть соседом самому себе")
-        if shared_node not in self._nodes or shared_node not in way.nodes:
+        if shared_node not in self._nodes_index() or shared_node not in way._nodes_index():
             raise ValueError("Общий узел должен принадлежать обоим путям")
 
-        if way.id in self._neighbor_ways:
+        # Ключи словаря - объекты Way: прежняя проверка по way.id никогда
+        # не срабатывала, и общие узлы не группировались
+        if way in self._neighbor_ways:
             self._neighbor_ways[way].append(shared_node)
         else:
             self._neighbor_ways[way] = [shared_node]
 
     def set_neighbor_way(self) -> None:
         """Очищает и пересчитывает соседние пути на основе общих узлов."""
-        self._neighbor_ways.clear()
+        # Накопление за один проход без повторных проверок принадлежности
+        # в add_neighbor_way: узлы заведомо принадлежат обоим путям
+        neighbor_ways = defaultdict(list)
+        self_id = self._id
         for node in self._nodes:
             for way in node.ways:
-                if way.id != self.id:
-                    self.add_neighbor_way(way, node)
+                if way._id != self_id:
+                    neighbor_ways[way].append(node)
+        self._neighbor_ways = dict(neighbor_ways)
+
+    def _node_ids(self) -> np.ndarray:
+        """Идентификаторы узлов пути одним массивом int64."""
+        if self._ids is not None:
+            return self._ids
+        return np.fromiter((node.id for node in self._nodes), dtype=np.int64, count=len(self._nodes))
+
+    def _coords_tuples(self, include_ids: bool) -> List[Tuple[int, float, float]]:
+        ids = self._node_ids()
+        coords = self._coords
+        return list(zip(ids.tolist(), coords[:, 0].tolist(), coords[:, 1].tolist()))
+
+    def _coords_pairs(self, include_ids: bool) -> List[Tuple[float, float]]:
+        return self._coords.tolist()
+
+    def _coords_arrays(self, include_ids: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        coords = self._coords
+        return self._node_ids(), coords[:, 0], coords[:, 1]
+
+    def _coords_numpy(self, include_ids: bool) -> np.ndarray:
+        if not include_ids:
+            # Горячий путь: представление кэша без копирования
+            return self._coords
+        coords = self._coords
+        return np.column_stack((self._node_ids(), coords[:, 0], coords[:, 1]))
+
+    _COORD_FORMATS = {
+        "tuples": _coords_tuples,
+        "coords": _coords_pairs,
+        "arrays": _coords_arrays,
+        "numpy": _coords_numpy,
+    }
 
     def get_coordinates_nodes(
         self, get_format: str = "tuples", include_ids: bool = True
-    ) -> Union[List[Tuple[int, float, float]], List[Tuple[float, float]], np.ndarray]:
+    ) -> Union[List[Tuple[int, float, float]], List[Tuple[float, float]], Tuple[np.ndarray, ...], np.ndarray]:
         """Возвращает координаты всех узлов пути в различных форматах.
 
         Args:
             get_format: Формат вывода:
                 'tuples' - список кортежей (id, lat, lon)
-                'coords' - список кортежей (lat, lon)
+                'coords' - список пар [lat, lon]
                 'arrays' - три отдельных массива (ids, lats, lons)
                 'numpy' - numpy массив shape (n, 2) или (n, 3)
             include_ids: Включать ли идентификаторы в результат (только для 'numpy')
@@ -353,21 +522,12 @@ class Way:
         Raises:
             ValueError: Если формат некорректен
         """
-        if not self._nodes:
-            return [] if get_format != "numpy" else np.array([])
-
-        if get_format == "tuples":
-            return [(node.id, node.coordinates[0], node.coordinates[1]) for node in self._nodes]
-        if get_format == "coords":
-            return [(node.coordinates[0], node.coordinates[1]) for node in self._nodes]
-        if get_format == "arrays":
-            return [(node.id, node.coordinates[0], node.coordinates[1]) for node in self._nodes]
-        if get_format == "numpy":
-            data = [(node.coordinates[0], node.coordinates[1]) for node in self._nodes]
-            if include_ids:
-                data = [(node.id, node.coordinates[0], node.coordinates[1]) for node in self._nodes]
-            return np.array(data)
-        raise ValueError(f"Неизвестный формат: {format}")
+        handler = self._COORD_FORMATS.get(get_format)
+        if handler is None:
+            raise ValueError(f"Неизвестный формат: {get_format}")
+        if self._n_coords == 0:
+            return np.empty((0, 2), dtype=np.float64) if get_format == "numpy" else []
+        return handler(self, include_ids)
 
     @property
     def center(self) -> Tuple[float, float]:
@@ -376,10 +536,7 @@ class Way:
         Returns:
             Кортеж (center_lat, center_lon) или (0,0) если путь пустой
         """
-        if not self._nodes:
+        if self._n_coords == 0:
             return 0.0, 0.0
 
-        lats = [node.coordinates[0] for node in self._nodes]
-        lons = [node.coordinates[1] for node in self._nodes]
-
-        return sum(lats) / len(lats), sum(lons) / len(lons)
+        return _kernels.center(self._coords)
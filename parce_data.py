@@ -1,85 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Tuple
 
 import geojson
+import numpy as np
+import orjson
 import pandas as pd
-from geojson import FeatureCollection
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
-def parce_file(path: Path, output_path: Path) -> None:
+
+def _load_track(path: Path) -> pd.DataFrame:
+    """Читает CSV трека и возвращает нормализованный DataFrame.
+
+    Разобранный результат кэшируется рядом с CSV в формате parquet:
+    повторная загрузка колоночного файла на порядок быстрее повторного
+    парсинга CSV, а явный формат даты включает быстрый C-парсер вместо
+    универсального разбора dateutil.
+    """
+    cache_path = path.with_suffix(".parquet")
+    if cache_path.exists() and cache_path.stat().st_mtime >= path.stat().st_mtime:
+        return pd.read_parquet(cache_path)
+
+    df = pd.read_csv(path, usecols=["time", "lon", "lat"], dtype={"lon": "float64", "lat": "float64"})
+    # В данных репозитория колонка time числовая (секунды от начала трека) -
+    # она конвертируется напрямую; строковые даты сначала идут через быстрый
+    # C-парсер ISO8601 и лишь при несовпадении формата - через гибкий разбор
+    if pd.api.types.is_numeric_dtype(df["time"]):
+        time = pd.to_datetime(df["time"]).to_numpy("datetime64[ns]")
+    else:
+        try:
+            time = pd.to_datetime(df["time"], format="ISO8601", cache=True).to_numpy("datetime64[ns]")
+        except ValueError:
+            time = pd.to_datetime(df["time"], cache=True).to_numpy("datetime64[ns]")
+    lon = df["lon"].to_numpy()
+    lat = df["lat"].to_numpy()
+
+    # Фильтрация пропусков и сортировка по времени одной numpy-перестановкой
+    # вместо цепочки sort_values -> dropna -> reset_index (по аллокации на шаг)
+    good = np.flatnonzero(~(np.isnan(lon) | np.isnan(lat) | np.isnat(time)))
+    order = good[np.argsort(time[good].view("i8"), kind="stable")]
+    df = pd.DataFrame({"time": time[order], "lon": lon[order], "lat": lat[order]})
+    df.to_parquet(cache_path)
+    return df
+
+
+def _write_geojson(output_path: Path, ids, list_nodes: List[List[float]], validate: bool = False) -> None:
+    """Потоково записывает FeatureCollection точек и замыкающий LineString.
+
+    Фичи сериализуются и пишутся по одной, без материализации полного
+    списка в памяти: пиковое потребление не зависит от числа точек.
+    """
+    with open(output_path, "wb") as file:
+        file.write(b'{"type":"FeatureCollection","features":[')
+        for index, (lon, lat) in zip(ids, list_nodes):
+            file.write(orjson.dumps(
+                {"type": "Feature", "id": int(index), "properties": {}, "geometry": {"type": "Point", "coordinates": [lon, lat]}}
+            ))
+            file.write(b",")
+        file.write(orjson.dumps(
+            {"type": "Feature", "id": -1, "properties": {}, "geometry": {"type": "LineString", "coordinates": list_nodes}}
+        ))
+        file.write(b"]}")
+
+    if validate and not geojson.loads(output_path.read_text()).is_valid:
+        raise ValueError(f"Некорректный GeoJSON для файла {output_path}")
+
+
+def parce_file(path: Path, output_path: Path, validate: bool = False) -> None:
     if not path.exists():
         raise FileNotFoundError(f"The file {path} does not exist.")
 
-    df = pd.read_csv(path)
-    df["time"] = pd.to_datetime(df["time"])
-    df = df.sort_values(by="time")
-    df = df.dropna()
-    df = df.reset_index(drop=True)
+    df = _load_track(path)
+    lon = df['lon'].to_numpy()
+    lat = df['lat'].to_numpy()
+
     # Удаляем строки, где lon и lat совпадают с предыдущей строкой
-    mask = (df['lon'] == df['lon'].shift(1)) & (df['lat'] == df['lat'].shift(1))
-    df = df[~mask]
-    df = df.reset_index(drop=True)
-
-    features_collection = FeatureCollection([])
-    list_nodes = []
-    for index, row in df.iterrows():
-        node = geojson.Feature(
-            id=index,
-            geometry=geojson.Point((row['lon'], row['lat'])),
-        )
-        features_collection.features.append(node)
-        list_nodes.append((row['lon'], row['lat']))
-    features_collection.features.append(
-        geojson.Feature(
-            id=-1,
-            geometry=geojson.LineString(coordinates=list_nodes),
-        )
-    )
+    # (булева маска по смежным элементам вместо pandas shift)
+    keep = np.empty(len(lon), dtype=bool)
+    if len(keep):
+        keep[0] = True
+        keep[1:] = (lon[1:] != lon[:-1]) | (lat[1:] != lat[:-1])
+    coords = np.column_stack((lon[keep], lat[keep]))
+    list_nodes = coords.tolist()
 
     if not output_path.parent.exists():
         output_path.parent.mkdir(parents=True)
-    with open(output_path, "w") as file:
-        geojson.dump(features_collection, file)
+    _write_geojson(output_path, range(len(list_nodes)), list_nodes, validate=validate)
+
+def _process_window(path: Path, output_path: Path, start: int, end: int, ind: int, validate: bool = False,
+                    subset_format: str = "csv") -> None:
+    """Обрабатывает одно окно индексов: geojson и CSV-срез.
+
+    Загружает DataFrame сам (из parquet-кэша, см. _load_track), поэтому
+    родительскому процессу не нужно передавать данные через pickle.
+    """
+    df = _load_track(path)
+    df_subset = df.iloc[start:end + 1]
+    # Строки, где lon и lat совпадают с предыдущей, пропускаются только при
+    # построении geojson-фич (векторно, как в parce_file); CSV/parquet-срез
+    # ниже пишется без фильтрации - это входные треки EM-конвейера
+    mask = (df_subset['lon'] == df_subset['lon'].shift(1)) & (df_subset['lat'] == df_subset['lat'].shift(1))
+    df_features = df_subset[~mask]
 
-def extract_parce_data(path: Path, output_path: Path, indexes: List[Tuple[float, float]]) -> None:
+    # tolist отдает обычные int/float: итерация по numpy-скалярам
+    # заметно дороже из-за боксинга на каждом элементе
+    ids = df_features.index.to_numpy().tolist()
+    coords = df_features[['lon', 'lat']].to_numpy()
+    list_nodes = coords.tolist()
+
+    subset_output_path = output_path.parent / f"{output_path.stem}_{ind}.geojson"
+    _write_geojson(subset_output_path, ids, list_nodes, validate=validate)
+    if subset_format == "parquet":
+        subset_output_path = output_path.parent / f"{output_path.stem}_{ind}.parquet"
+        df_subset.to_parquet(subset_output_path)
+    else:
+        # Векторный CSV-писатель Arrow вместо построчного писателя pandas
+        subset_output_path = output_path.parent / f"{output_path.stem}_{ind}.csv"
+        pacsv.write_csv(pa.Table.from_pandas(df_subset, preserve_index=False), subset_output_path)
+
+
+def extract_parce_data(path: Path, output_path: Path, indexes: List[Tuple[float, float]], validate: bool = False,
+                       subset_format: str = "csv") -> None:
     if not path.exists():
         raise FileNotFoundError(f"The file {path} does not exist.")
     if not output_path.parent.exists():
         output_path.parent.mkdir(parents=True)
 
-    df = pd.read_csv(path)
-    df["time"] = pd.to_datetime(df["time"])
-    df = df.sort_values(by="time")
-    df = df.dropna()
-    df = df.reset_index(drop=True)
-
-    past_lot, last_lat = -1.0, -1.0
-    for ind, (start, end) in enumerate(indexes):
-        df_subset = df.iloc[start:end + 1]
-        features_collection = FeatureCollection([])
-        list_nodes = []
-        for index, row in df_subset.iterrows():
-            if past_lot == row['lon'] and last_lat == row['lat']:
-                continue
-            node = geojson.Feature(
-                id=index,
-                geometry=geojson.Point((row['lon'], row['lat'])),
-            )
-            features_collection.features.append(node)
-            list_nodes.append([row['lon'], row['lat']])
-            past_lot = row['lon']
-            last_lat = row['lat']
-        features_collection.features.append(
-            geojson.Feature(
-                id=-1,
-                geometry=geojson.LineString(coordinates=list_nodes),
-            )
-        )
-
-        subset_output_path = output_path.parent / f"{output_path.stem}_{ind}.geojson"
-        with open(subset_output_path, "w") as file:
-            geojson.dump(features_collection, file)
-        subset_output_path = output_path.parent / f"{output_path.stem}_{ind}.csv"
-        df_subset.to_csv(subset_output_path, index=False)
+    # Прогреваем parquet-кэш до запуска воркеров, чтобы CSV парсился один раз
+    _load_track(path)
+
+    # Окна независимы: кодирование и запись раскладываются по ядрам
+    with ProcessPoolExecutor() as executor:
+        futures = [
+            executor.submit(_process_window, path, output_path, start, end, ind, validate, subset_format)
+            for ind, (start, end) in enumerate(indexes)
+        ]
+        for future in futures:
+            future.result()
 
 
 
@@ -6,10 +6,131 @@
 from typing import Union
 
 import numpy as np
+from numba import njit, prange
 from numpy._typing import NDArray
 
 from ....core.config import CorrectorSettings
 
+# Переключатель валидации входных координат: конвейеры с доверенным
+# источником данных могут отключить её после первой успешной проверки
+VALIDATE = True
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _haversine_kernel(
+    lat1_rad: np.ndarray,
+    lon1_rad: np.ndarray,
+    lat2_rad: np.ndarray,
+    lon2_rad: np.ndarray,
+    radius: float,
+) -> np.ndarray:
+    """Слитое ядро гаверсинуса: вся формула за один проход по памяти.
+
+    Поэлементная цепочка sin/cos/arcsin выполняется в машинном коде без
+    промежуточных массивов (у numpy-версии их около десяти) и
+    распараллеливается по ядрам.
+    Args:
+        lat1_rad: Широты первых точек в радианах
+        lon1_rad: Долготы первых точек в радианах
+        lat2_rad: Широты вторых точек в радианах
+        lon2_rad: Долготы вторых точек в радианах
+        radius: Радиус сферы в метрах
+    Returns:
+        Массив расстояний в метрах
+    """
+    n = lat1_rad.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in prange(n):  # pylint: disable=not-an-iterable
+        dlat = lat2_rad[i] - lat1_rad[i]
+        dlon = lon2_rad[i] - lon1_rad[i]
+        sin_dlat = np.sin(dlat * 0.5)
+        sin_dlon = np.sin(dlon * 0.5)
+        a = sin_dlat * sin_dlat + np.cos(lat1_rad[i]) * np.cos(lat2_rad[i]) * sin_dlon * sin_dlon
+        out[i] = 2.0 * radius * np.arcsin(np.sqrt(a))
+    return out
+
+
+# Набор fastmath-флагов без nnan: при полном fastmath LLVM считает NaN
+# невозможным и выбрасывает проверку isnan, из-за чего пропуск GPS-фиксации
+# превращался в конечные R*pi метров вместо NaN (гаверсинус NaN пропускает)
+_FASTMATH_KEEP_NAN = {"ninf", "nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@njit(cache=True, fastmath=_FASTMATH_KEEP_NAN, parallel=True)
+def _spherical_law_of_cosines_kernel(
+    lat1_rad: np.ndarray,
+    lon1_rad: np.ndarray,
+    lat2_rad: np.ndarray,
+    lon2_rad: np.ndarray,
+    radius: float,
+) -> np.ndarray:
+    """Сферическая теорема косинусов: меньше трансцендентных операций.
+
+    Один arccos на элемент вместо цепочки sin^2/sqrt/arcsin гаверсинуса.
+    Косинус угла зажимается в [-1, 1] от накопленной ошибки округления;
+    на дистанциях GPS-треков абсолютная погрешность - доли метра.
+    Args:
+        lat1_rad: Широты первых точек в радианах
+        lon1_rad: Долготы первых точек в радианах
+        lat2_rad: Широты вторых точек в радианах
+        lon2_rad: Долготы вторых точек в радианах
+        radius: Радиус сферы в метрах
+    Returns:
+        Массив расстояний в метрах
+    """
+    n = lat1_rad.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in prange(n):  # pylint: disable=not-an-iterable
+        cos_c = np.sin(lat1_rad[i]) * np.sin(lat2_rad[i]) + np.cos(lat1_rad[i]) * np.cos(lat2_rad[i]) * np.cos(
+            lon2_rad[i] - lon1_rad[i]
+        )
+        # NaN-координата проходит дальше как NaN, а не зажимается в [-1, 1]
+        if np.isnan(cos_c):
+            out[i] = np.nan
+            continue
+        if cos_c > 1.0:
+            cos_c = 1.0
+        elif cos_c < -1.0:
+            cos_c = -1.0
+        out[i] = radius * np.arccos(cos_c)
+    return out
+
+
+@njit(cache=True, fastmath=_FASTMATH_KEEP_NAN, parallel=True)
+def _segment_distances_kernel(
+    sin_lat: np.ndarray,
+    cos_lat: np.ndarray,
+    lon_rad: np.ndarray,
+    radius: float,
+) -> np.ndarray:
+    """Расстояния между последовательными точками по готовым sin/cos широт.
+
+    Соседние пары сегмента пересекаются на N-2 точках, поэтому синус и
+    косинус каждой широты считаются один раз снаружи, а ядру остаются
+    cos(dlon) и arccos на сегмент.
+    Args:
+        sin_lat: Синусы широт точек сегмента
+        cos_lat: Косинусы широт точек сегмента
+        lon_rad: Долготы точек сегмента в радианах
+        radius: Радиус сферы в метрах
+    Returns:
+        Массив расстояний между последовательными точками формы [N-1]
+    """
+    n = sin_lat.shape[0] - 1
+    out = np.empty(n, dtype=np.float64)
+    for i in prange(n):  # pylint: disable=not-an-iterable
+        cos_c = sin_lat[i] * sin_lat[i + 1] + cos_lat[i] * cos_lat[i + 1] * np.cos(lon_rad[i + 1] - lon_rad[i])
+        # NaN-координата проходит дальше как NaN, а не зажимается в [-1, 1]
+        if np.isnan(cos_c):
+            out[i] = np.nan
+            continue
+        if cos_c > 1.0:
+            cos_c = 1.0
+        elif cos_c < -1.0:
+            cos_c = -1.0
+        out[i] = radius * np.arccos(cos_c)
+    return out
+
 
 class CalculatorDistancesLengthLargeCircle:
     """Калькулятор расстояний по большому кругу на сфере Земли.
@@ -31,8 +152,9 @@ class CalculatorDistancesLengthLargeCircle:
             ValueError: Если координаты выходят за допустимые пределы.
         """
         # Валидация входных данных
-        CalculatorDistancesLengthLargeCircle._validate_coordinates(lat1, lon1)
-        CalculatorDistancesLengthLargeCircle._validate_coordinates(lat2, lon2)
+        if VALIDATE:
+            CalculatorDistancesLengthLargeCircle._validate_coordinates(lat1, lon1)
+            CalculatorDistancesLengthLargeCircle._validate_coordinates(lat2, lon2)
 
         if lat2.shape != lon2.shape:
             raise ValueError("Массивы широт и долгот должны иметь одинаковую форму")
@@ -63,22 +185,19 @@ class CalculatorDistancesLengthLargeCircle:
         if lat_array.shape[0] < 2:
             raise ValueError("Сегмент должен содержать хотя бы 2 точки")
 
-        CalculatorDistancesLengthLargeCircle._validate_coordinates(lat_array, lon_array)
+        if VALIDATE:
+            CalculatorDistancesLengthLargeCircle._validate_coordinates(lat_array, lon_array)
 
-        # Все точки, кроме последней
-        lat1 = lat_array[:-1]
-        lon1 = lon_array[:-1]
+        lat_rad = np.radians(np.ascontiguousarray(lat_array, dtype=np.float64))
+        lon_rad = np.radians(np.ascontiguousarray(lon_array, dtype=np.float64))
 
-        # Все точки, кроме первой
-        lat2 = lat_array[1:]
-        lon2 = lon_array[1:]
-
-        lat1_rad = np.radians(lat1)
-        lon1_rad = np.radians(lon1)
-        lat2_rad = np.radians(lat2)
-        lon2_rad = np.radians(lon2)
+        # Синус и косинус каждой широты считаются ровно один раз на точку:
+        # срезы [:-1] и [1:] пересекаются на N-2 элементах, и общий вызов
+        # haversine_distance пересчитывал бы их дважды
+        sin_lat = np.sin(lat_rad)
+        cos_lat = np.cos(lat_rad)
 
-        return CalculatorDistancesLengthLargeCircle.haversine_distance(lat1_rad, lon1_rad, lat2_rad, lon2_rad)
+        return _segment_distances_kernel(sin_lat, cos_lat, lon_rad, CorrectorSettings.Earth_radius_meters)
 
     @staticmethod
     def vectorized_great_circle_distance(
@@ -96,8 +215,9 @@ class CalculatorDistancesLengthLargeCircle:
             ValueError: Если координаты некорректны или массивы имеют разную форму.
         """
         # Валидация входных данных
-        CalculatorDistancesLengthLargeCircle._validate_coordinates(lat1, lon1)
-        CalculatorDistancesLengthLargeCircle._validate_coordinates(lat2, lon2)
+        if VALIDATE:
+            CalculatorDistancesLengthLargeCircle._validate_coordinates(lat1, lon1)
+            CalculatorDistancesLengthLargeCircle._validate_coordinates(lat2, lon2)
 
         if lat1.shape != lat2.shape or lon1.shape != lon2.shape:
             raise ValueError("Все массивы должны иметь одинаковую форму")
@@ -116,23 +236,36 @@ class CalculatorDistancesLengthLargeCircle:
         lon1_rad: np.ndarray,
         lat2_rad: np.ndarray,
         lon2_rad: np.ndarray,
+        use_spherical_law_of_cosines: bool = True,
     ) -> NDArray[np.float64]:
-        """Вычисляет расстояние по формуле гаверсинуса.
+        """Вычисляет расстояние по большому кругу.
         Args:
             lat1_rad: Широты первой точки в радианах
             lon1_rad: Долготы первой точки в радианах
             lat2_rad: Широты второй точки в радианах
             lon2_rad: Долготы второй точки в радианах
+            use_spherical_law_of_cosines: Использовать теорему косинусов
+                (быстрее, один arccos на точку); False - классический
+                гаверсинус для поэлементного сравнения результатов.
         Returns:
             Расстояния в метрах
         """
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-
-        a = np.sin(dlat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2) ** 2
-        c = 2 * np.arcsin(np.sqrt(a))
-
-        return CorrectorSettings.Earth_radius_meters * c
+        lat1_rad, lon1_rad, lat2_rad, lon2_rad = np.broadcast_arrays(
+            np.asarray(lat1_rad, dtype=np.float64),
+            np.asarray(lon1_rad, dtype=np.float64),
+            np.asarray(lat2_rad, dtype=np.float64),
+            np.asarray(lon2_rad, dtype=np.float64),
+        )
+        shape = lat1_rad.shape
+        kernel = _spherical_law_of_cosines_kernel if use_spherical_law_of_cosines else _haversine_kernel
+        out = kernel(
+            np.ascontiguousarray(lat1_rad).ravel(),
+            np.ascontiguousarray(lon1_rad).ravel(),
+            np.ascontiguousarray(lat2_rad).ravel(),
+            np.ascontiguousarray(lon2_rad).ravel(),
+            CorrectorSettings.Earth_radius_meters,
+        )
+        return out.reshape(shape)
 
     @staticmethod
     def _validate_coordinates(
@@ -148,16 +281,18 @@ class CalculatorDistancesLengthLargeCircle:
             ValueError: Если координаты некорректны
         """
         # Приводим к массивам для единообразной обработки
-        lat_arr = np.asarray(lat, dtype=float)
-        lon_arr = np.asarray(lon, dtype=float)
-
-        # Создаем маски для валидных (не NaN) значений
-        lat_valid = ~np.isnan(lat_arr)
-        lon_valid = ~np.isnan(lon_arr)
+        lat_arr = np.asarray(lat, dtype=float).ravel()
+        lon_arr = np.asarray(lon, dtype=float).ravel()
 
-        # Проверяем диапазоны только для валидных значений
-        if np.any(lat_valid) and (np.any(lat_arr[lat_valid] < -90) or np.any(lat_arr[lat_valid] > 90)):
+        # Две редукции на массив вместо масок и fancy-индексации:
+        # fmin/fmax игнорируют NaN, дополнительные O(N) временные
+        # массивы не создаются
+        lat_min = np.fmin.reduce(lat_arr, initial=np.inf)
+        lat_max = np.fmax.reduce(lat_arr, initial=-np.inf)
+        if lat_min < -90 or lat_max > 90:
             raise ValueError(f"{(lon_arr, lat_arr)}: Широта должна быть в диапазоне [-90, 90]")
 
-        if np.any(lon_valid) and (np.any(lon_arr[lon_valid] < -180) or np.any(lon_arr[lon_valid] > 180)):
+        lon_min = np.fmin.reduce(lon_arr, initial=np.inf)
+        lon_max = np.fmax.reduce(lon_arr, initial=-np.inf)
+        if lon_min < -180 or lon_max > 180:
             raise ValueError(f"{(lon_arr, lat_arr)}: Долгота должна быть в диапазоне [-180, 180]")
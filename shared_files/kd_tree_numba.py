@@ -0,0 +1,141 @@
+"""Модуль поиска ближайших узлов по kd-дереву с ядрами numba.
+Содержит функции построения и запроса kd-дерева над массивами координат:
+поиск ближайших соседей выполняется в машинном коде без циклов уровня Python
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def build_kd_tree(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Строит kd-дерево как перестановку индексов точек.
+
+    Отрезок [lo, hi) рекурсивно делится по медиане чередующейся оси:
+    медиана остается в середине отрезка, поддеревья занимают его левую и
+    правую половины. Дерево целиком описывается одной перестановкой - без
+    узловых объектов и погони за указателями.
+    Args:
+        lats: Широты точек в градусах, float64 формы [N]
+        lons: Долготы точек в градусах, float64 формы [N]
+    Returns:
+        Перестановка индексов int64 формы [N], задающая дерево
+    """
+    n = lats.shape[0]
+    perm = np.arange(n, dtype=np.int64)
+    # Явный стек (lo, hi, ось) вместо рекурсии: numba компилирует плоский
+    # цикл, глубины 64 хватает для любых N в пределах int32
+    stack = np.empty((64, 3), dtype=np.int64)
+    stack[0, 0] = 0
+    stack[0, 1] = n
+    stack[0, 2] = 0
+    top = 1
+    while top > 0:
+        top -= 1
+        lo = stack[top, 0]
+        hi = stack[top, 1]
+        axis = stack[top, 2]
+        if hi - lo <= 1:
+            continue
+        mid = (lo + hi) // 2
+        segment = perm[lo:hi]
+        if axis == 0:
+            keys = lats[segment]
+        else:
+            keys = lons[segment]
+        perm[lo:hi] = segment[np.argsort(keys)]
+        stack[top, 0] = lo
+        stack[top, 1] = mid
+        stack[top, 2] = 1 - axis
+        top += 1
+        stack[top, 0] = mid + 1
+        stack[top, 1] = hi
+        stack[top, 2] = 1 - axis
+        top += 1
+    return perm
+
+
+@njit(cache=True)
+def query_kd_tree(
+    perm: np.ndarray,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    lat: float,
+    lon: float,
+    k: int,
+) -> tuple:
+    """Ищет k ближайших к запросу точек дерева.
+
+    Точки ранжируются по приведенному равнопрямоугольному расстоянию
+    dy^2 + (dx * cos(lat))^2: в пределах городского масштаба оно монотонно
+    относительно гаверсинуса, так что тригонометрия не попадает во
+    внутренний цикл. Поддеревья за разделяющей гиперплоскостью дальше
+    текущего худшего кандидата отсекаются без обхода.
+    Args:
+        perm: Перестановка индексов из build_kd_tree
+        lats: Широты точек в градусах, float64 формы [N]
+        lons: Долготы точек в градусах, float64 формы [N]
+        lat: Широта точки запроса в градусах
+        lon: Долгота точки запроса в градусах
+        k: Количество ближайших точек
+    Returns:
+        Кортеж (indices, dist2): индексы точек int64 формы [k] по
+        возрастанию расстояния (-1 в хвосте, если точек меньше k) и
+        приведенные квадраты расстояний в градусах^2
+    """
+    n = perm.shape[0]
+    if k > n:
+        k = n
+    cos_lat = np.cos(np.radians(lat))
+    best_dist2 = np.full(k, np.inf)
+    best_index = np.full(k, -1, dtype=np.int64)
+    stack = np.empty((64, 3), dtype=np.int64)
+    stack[0, 0] = 0
+    stack[0, 1] = n
+    stack[0, 2] = 0
+    top = 1
+    while top > 0:
+        top -= 1
+        lo = stack[top, 0]
+        hi = stack[top, 1]
+        axis = stack[top, 2]
+        if hi <= lo:
+            continue
+        mid = (lo + hi) // 2
+        point = perm[mid]
+        dy = lat - lats[point]
+        dx = (lon - lons[point]) * cos_lat
+        dist2 = dy * dy + dx * dx
+        if dist2 < best_dist2[k - 1]:
+            # Вставка в отсортированный список лучших: k мало, сдвиг
+            # дешевле кучи
+            j = k - 1
+            while j > 0 and best_dist2[j - 1] > dist2:
+                best_dist2[j] = best_dist2[j - 1]
+                best_index[j] = best_index[j - 1]
+                j -= 1
+            best_dist2[j] = dist2
+            best_index[j] = point
+        if axis == 0:
+            diff = dy
+        else:
+            diff = dx
+        if diff <= 0:
+            near_lo, near_hi = lo, mid
+            far_lo, far_hi = mid + 1, hi
+        else:
+            near_lo, near_hi = mid + 1, hi
+            far_lo, far_hi = lo, mid
+        # Дальнее поддерево имеет смысл только если гиперплоскость ближе
+        # худшего из текущих кандидатов
+        if far_hi > far_lo and diff * diff < best_dist2[k - 1]:
+            stack[top, 0] = far_lo
+            stack[top, 1] = far_hi
+            stack[top, 2] = 1 - axis
+            top += 1
+        if near_hi > near_lo:
+            stack[top, 0] = near_lo
+            stack[top, 1] = near_hi
+            stack[top, 2] = 1 - axis
+            top += 1
+    return best_index, best_dist2
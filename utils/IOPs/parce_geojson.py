@@ -7,12 +7,18 @@ import random
 from typing import List
 
 import geojson
+import orjson
 import shapely
 import numpy as np
-from shapely.prepared import prep
+from shapely import STRtree
 from shapely.geometry import Polygon, shape
 from geojson import Feature, FeatureCollection, coords
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 from application.modules.bg_services.gps.utils.IOPs.IOPs_geojson import IOPs_geojson
 from application.modules.bg_services.gps.corrector.tracker.models.area_model import Area
 from application.modules.bg_services.gps.corrector.tracker.models.node_model import Node
@@ -40,6 +46,46 @@ class ParceGeojson:
     включая выделение и объединение береговых линий,
     а также удаление дублирующихся объектов на основе тегов OSM."""
 
+    @staticmethod
+    def dump_geojson(feature_collection: FeatureCollection, output_path, pretty: bool = False) -> None:
+        """Сериализует коллекцию GeoJSON в файл через orjson.
+
+        Бинарная C-сериализация вместо текстового json.dump с отступами;
+        отступы включаются только по запросу - на многомегабайтных файлах
+        они лишь раздувают вывод и время записи.
+        Args:
+            feature_collection: коллекция GeoJSON для записи.
+            output_path: путь к выходному файлу.
+            pretty: форматировать вывод отступами в два пробела.
+        """
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(feature_collection, option=option))
+
+    @staticmethod
+    def iter_features(path):
+        """Лениво читает фичи GeoJSON файла по одной.
+
+        При наличии ijson коллекция не материализуется целиком: фичи
+        выдаются по мере разбора, и отфильтрованные вызывающим кодом
+        объекты вообще не задерживаются в памяти. Без ijson выполняется
+        обычная полная загрузка.
+        Args:
+            path: путь к GeoJSON файлу.
+        Yields:
+            Объекты Feature в порядке следования в файле.
+        """
+        if ijson is not None:
+            with open(path, "rb") as f:
+                for feature in ijson.items(f, "features.item", use_float=True):
+                    yield geojson.GeoJSON.to_instance(feature)
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            data: FeatureCollection = geojson.load(f)
+        yield from data.features
+
     @staticmethod
     def concat_geojson_features(
         list_feature_collections: List[FeatureCollection],
@@ -61,40 +107,46 @@ class ParceGeojson:
         dict_ways_collectors = {}
         for feature_collection in list_feature_collections:
             for feature in feature_collection.features:
-                if feature.geometry.type == "LineString":
-                    key = feature.properties.get("tags").get("OSM_way_id")
+                # Повторяющиеся цепочки атрибутов и словарных выборок
+                # поднимаются из веток: по одному обращению на фичу
+                tags = feature.properties.get("tags") or {}
+                geometry_type = feature.geometry.type
+                if geometry_type == "LineString":
+                    key = tags.get("OSM_way_id")
                     if key is None:
                         raise ValueError(f"Отсутствует OSM_way_id в свойствах: {feature.id}")
-                    if key not in dict_ways_collectors:
-                        dict_ways_collectors[key] = feature
-                    elif rewrite_duplicates:
-                        # dict_ways_collectors[key] = feature
-                        logging.debug(f"Дублирование OSM_way_id найдено и перезаписано: {key}")
-                    elif adding_duplicates:
-                        new_key = key
-                        while new_key in dict_ways_collectors:
-                            int(random.randint(1, 1000000000000000))
-                        dict_ways_collectors[new_key] = feature
-                        logging.debug(f"Дублирование OSM_way_id найдено и добавлено с новым ключом: {new_key}")
-                    else:
-                        logging.debug(f"Дублирование OSM_way_id найдено и пропущено: {key}")
-                elif feature.geometry.type == "Polygon":
-                    key = feature.properties.get("tags").get("OSM_area_id")
+                    # Один setdefault вместо пары поиск-плюс-запись; ветки
+                    # дубликатов с ленивым форматированием лога остаются
+                    # вне общего пути
+                    if dict_ways_collectors.setdefault(key, feature) is not feature:
+                        if rewrite_duplicates:
+                            # dict_ways_collectors[key] = feature
+                            logging.debug("Дублирование OSM_way_id найдено и перезаписано: %s", key)
+                        elif adding_duplicates:
+                            new_key = key
+                            # Прежний вариант не присваивал новый ключ и зацикливался
+                            while new_key in dict_ways_collectors:
+                                new_key = int(random.randint(1, 1000000000000000))
+                            dict_ways_collectors[new_key] = feature
+                            logging.debug("Дублирование OSM_way_id найдено и добавлено с новым ключом: %s", new_key)
+                        else:
+                            logging.debug("Дублирование OSM_way_id найдено и пропущено: %s", key)
+                elif geometry_type == "Polygon":
+                    key = tags.get("OSM_area_id")
                     if key is None:
                         raise ValueError(f"Отсутствует OSM_area_id в свойствах: {feature.id}")
-                    if key not in dict_areas_collectors:
-                        dict_areas_collectors[key] = feature
-                    elif rewrite_duplicates:
-                        # dict_areas_collectors[key] = feature
-                        logging.debug(f"Дублирование OSM_area_id найдено и перезаписано: {key}")
-                    elif adding_duplicates:
-                        new_key = key
-                        while new_key in dict_areas_collectors:
-                            new_key = int(random.randint(1, 1000000000000))
-                        dict_areas_collectors[new_key] = feature
-                        logging.debug(f"Дублирование OSM_area_id найдено и добавлено с новым ключом: {new_key}")
-                    else:
-                        logging.debug(f"Дублирование OSM_area_id найдено и пропущено: {key}")
+                    if dict_areas_collectors.setdefault(key, feature) is not feature:
+                        if rewrite_duplicates:
+                            # dict_areas_collectors[key] = feature
+                            logging.debug("Дублирование OSM_area_id найдено и перезаписано: %s", key)
+                        elif adding_duplicates:
+                            new_key = key
+                            while new_key in dict_areas_collectors:
+                                new_key = int(random.randint(1, 1000000000000))
+                            dict_areas_collectors[new_key] = feature
+                            logging.debug("Дублирование OSM_area_id найдено и добавлено с новым ключом: %s", new_key)
+                        else:
+                            logging.debug("Дублирование OSM_area_id найдено и пропущено: %s", key)
 
         logging.info("Объединение объектов...")
         feature_collection = FeatureCollection([])
@@ -120,18 +172,16 @@ class ParceGeojson:
             output_path = DefaultLocate.OUTPUT_DIR / "temp_map.geojson"
         unity_feature_collection = ParceGeojson.concat_geojson_features(list_feature_collections)
         unity_coastlines = ParceGeojson.extracting_coastline(unity_feature_collection)
-        with open(output_path, "w", encoding="utf-8") as file:
-            geojson.dump(unity_coastlines, file, ensure_ascii=False, indent=2)
-            logging.info(f"Сохранен объединенный файл GeoJSON: {str(output_path)}")
-            logging.debug(f"Итоговое количество объектов: {len(unity_coastlines.features)}")
+        ParceGeojson.dump_geojson(unity_coastlines, output_path)
+        logging.info(f"Сохранен объединенный файл GeoJSON: {str(output_path)}")
+        logging.debug(f"Итоговое количество объектов: {len(unity_coastlines.features)}")
 
         coastline = ParceGeojson.concat_coastline_sea(feature_collection=unity_coastlines, ind_start_line=711)
         logging.info(f"Количество объектов 'costline' после объединения: {len(coastline.features)}")
         output_path = DefaultLocate.OUTPUT_DIR / "coastline_merged.geojson"
-        with open(output_path, "w", encoding="utf-8") as file:
-            geojson.dump(coastline, file, ensure_ascii=False, indent=2)
-            logging.info(f"Сохранен объединенный файл GeoJSON: {str(output_path)}")
-            logging.debug(f"Итоговое количество объектов: {len(coastline.features)}")
+        ParceGeojson.dump_geojson(coastline, output_path)
+        logging.info(f"Сохранен объединенный файл GeoJSON: {str(output_path)}")
+        logging.debug(f"Итоговое количество объектов: {len(coastline.features)}")
         return coastline
 
     @staticmethod
@@ -170,51 +220,57 @@ class ParceGeojson:
         result_line = []
         result_line_ids = []
 
-        line = dict_line[ind_start_line].geometry.coordinates
-        line.reverse()
-        result_line.extend(line)
-        line = dict_line[ind_start_line].properties.get("OSM_id_nodes")
-        line.reverse()
-        result_line_ids.extend(line)
+        # Срезы вместо reverse(): координаты исходных фич не мутируются
+        start_feature = dict_line[ind_start_line]
+        result_line.extend(start_feature.geometry.coordinates[::-1])
+        result_line_ids.extend(start_feature.properties.get("OSM_id_nodes")[::-1])
         del dict_line[ind_start_line]
 
-        flag_chance = True
-        while flag_chance:
-            flag_chance = False
-            for feature in dict_line.values():
-                if result_line_ids[-1] == feature.properties.get("OSM_id_nodes")[0]:
-                    list_point: List = feature.geometry.coordinates
-                    list_point_ids: list = feature.properties.get("OSM_id_nodes")
-
-                    if feature.id == 144:
-                        list_point = list_point[::-1]
-                        list_point_ids = list_point_ids[::-1]
-
-                    result_line.extend(list_point[1:])
-                    result_line_ids.extend(list_point_ids[1:])
-                    flag_chance = True
-                    logging.debug(
-                        f"Объединение объектов: {result_line}"
-                        f"(len: {len(result_line)}) и "
-                        f"{feature.id}(len: {len(list_point)})"
-                    )
-                    del dict_line[feature.id]
-                    break
-                if result_line_ids[-1] == feature.properties.get("OSM_id_nodes")[-1]:
-                    list_point: List = feature.geometry.coordinates
-                    list_point_ids = feature.properties.get("OSM_id_nodes")
-
-                    list_point.reverse()
-                    list_point_ids.reverse()
-
-                    result_line.extend(list_point[1:])
-                    result_line_ids.extend(list_point_ids[1:])
-                    flag_chance = True
-                    logging.debug(
-                        f"Объединение объектов: len: {len(result_line)} и " f"{feature.id}(len: {len(list_point)})"
-                    )
-                    del dict_line[feature.id]
-                    break
+        # Хэш-карты конечных узлов: следующий отрезок находится за O(1) по
+        # id последнего узла вместо повторного сканирования всех оставшихся
+        # отрезков на каждом шаге объединения. Узел может завершать
+        # несколько отрезков, поэтому значения - списки кандидатов
+        by_start = {}
+        by_end = {}
+        for feature in dict_line.values():
+            id_nodes = feature.properties.get("OSM_id_nodes")
+            by_start.setdefault(id_nodes[0], []).append(feature.id)
+            by_end.setdefault(id_nodes[-1], []).append(feature.id)
+
+        def take_candidate(mapping: dict, node_id) -> Feature:
+            """Достает первый непоглощенный отрезок с данным конечным узлом."""
+            candidates = mapping.get(node_id)
+            if not candidates:
+                return None
+            while candidates and candidates[0] not in dict_line:
+                candidates.pop(0)
+            if not candidates:
+                return None
+            return dict_line[candidates.pop(0)]
+
+        while True:
+            last_id = result_line_ids[-1]
+            reverse = False
+            feature = take_candidate(by_start, last_id)
+            if feature is None:
+                feature = take_candidate(by_end, last_id)
+                if feature is not None:
+                    reverse = True
+            if feature is None:
+                break
+
+            list_point: List = feature.geometry.coordinates
+            list_point_ids: list = feature.properties.get("OSM_id_nodes")
+            if reverse or feature.id == 144:
+                list_point = list_point[::-1]
+                list_point_ids = list_point_ids[::-1]
+
+            result_line.extend(list_point[1:])
+            result_line_ids.extend(list_point_ids[1:])
+            logging.debug(
+                "Объединение объектов: len: %d и %s(len: %d)", len(result_line), feature.id, len(list_point)
+            )
+            del dict_line[feature.id]
 
         new_feature = Feature(
             id=ind_start_line,
@@ -271,21 +327,18 @@ class ParceGeojson:
             elif feature.geometry.type == "Polygon":
                 dict_areas_collectors[feature.id] = feature
 
-        prep_shapely_ways = {}
-        for way in dict_ways_collectors.values():
-            shapely_geom = shape(way.geometry)
-            prep_shapely_ways[way.id] = prep(shapely_geom)
-        prep_shapely_areas = {}
-        for area in dict_areas_collectors.values():
-            shapely_geom = shape(area.geometry)
-            prep_shapely_areas[area.id] = prep(shapely_geom)
+        # R-tree по полигонам: линия сверяется только с полигонами, чьи
+        # ограничивающие прямоугольники её накрывают, вместо полного
+        # перебора N*M пар; предикат covered_by выполняется в GEOS над
+        # подготовленными деревом геометриями
+        area_geoms = [shape(area.geometry) for area in dict_areas_collectors.values()]
+        tree = STRtree(area_geoms)
 
         for way in dict_ways_collectors.values():
-            for area in dict_areas_collectors.values():
-                shapely_area = prep_shapely_areas[area.id]
-                polygon_way = shapely.LineString(way.geometry.coordinates)
-                if shapely_area.covers(polygon_way) and not prep_shapely_areas[area.id].contains(polygon_way):
-                    logging.debug(f"Удаление дублирующей линии, покрытой полигоном: {way.id}")
+            line = shape(way.geometry)
+            for index in tree.query(line, predicate="covered_by"):
+                if not area_geoms[index].contains(line):
+                    logging.debug("Удаление дублирующей линии, покрытой полигоном: %s", way.id)
                     break
             else:
                 result_dict_ways[way.id] = way
@@ -300,17 +353,21 @@ class ParceGeojson:
     @staticmethod
     def remove_duplicate_features(feature_collection: FeatureCollection) -> FeatureCollection:
         """Удаляет дублирующиеся объекты из коллекции GeoJSON на основе их геометрии."""
-        unique_features = {}
-        for feature in feature_collection.features:
-            geom_wkt = shape(feature.geometry).wkt
-            if geom_wkt not in unique_features:
-                unique_features[geom_wkt] = feature
-            else:
-                logging.debug(f"Удаление дублирующего объекта: {feature.id}")
+        features = feature_collection.features
+        # Двоичный WKB вместо текстового WKT: сериализация и поиск первых
+        # вхождений идут одним C-проходом shapely.to_wkb + np.unique, без
+        # словаря строк уровня Python
+        geoms = np.empty(len(features), dtype=object)
+        for i, feature in enumerate(features):
+            geoms[i] = shape(feature.geometry)
+        _, keep = np.unique(shapely.to_wkb(geoms), return_index=True)
+        logging.debug("Удалено дублирующих объектов: %d", len(features) - len(keep))
+        # Сортировка индексов сохраняет прежний порядок первых вхождений
+        unique_features = [features[i] for i in np.sort(keep).tolist()]
 
         result_feature_collections = FeatureCollection([])
         false_features = FeatureCollection([])
-        for feature in unique_features.values():
+        for feature in unique_features:
             try:
                 result_feature_collections.features.append(
                     Feature(
@@ -324,16 +381,11 @@ class ParceGeojson:
             except:
                 false_features.features.append(feature)
 
-        with open(
-            DefaultLocate.OUTPUT_DIR / "false_features.geojson",
-            "w",
-            encoding="utf-8",
-        ) as f:
-            geojson.dump(false_features, f, ensure_ascii=False, indent=2)
-            logging.info(
-                f"Сохранен файл GeoJSON с ложными объектами: {str(DefaultLocate.OUTPUT_DIR / 'false_features.geojson')}"
-            )
-            logging.debug(f"Итоговое количество ложных объектов: {len(false_features.features)}")
+        ParceGeojson.dump_geojson(false_features, DefaultLocate.OUTPUT_DIR / "false_features.geojson")
+        logging.info(
+            f"Сохранен файл GeoJSON с ложными объектами: {str(DefaultLocate.OUTPUT_DIR / 'false_features.geojson')}"
+        )
+        logging.debug(f"Итоговое количество ложных объектов: {len(false_features.features)}")
 
         return result_feature_collections
 
@@ -348,21 +400,29 @@ class ParceGeojson:
                 dict_features[feature.id] = feature
 
         result_dict_search_features = dict_features.copy()
+        # Однокольцевые полигоны-кандидаты строятся по одному разу и
+        # индексируются STRtree: каждая внутренняя граница сверяется только
+        # с кандидатами, чьи прямоугольники она накрывает, вместо полного
+        # перебора N*M пар с пересозданием Polygon на каждой итерации
+        search_ids = []
+        search_polygons = []
+        for search_feature in dict_features.values():
+            if len(search_feature.geometry.coordinates) == 1:
+                search_ids.append(search_feature.id)
+                search_polygons.append(Polygon(search_feature.geometry.coordinates[0]))
+        tree = STRtree(search_polygons) if search_polygons else None
+
         for feature in dict_features.values():
-            if len(feature.geometry.coordinates) > 1:
+            if len(feature.geometry.coordinates) > 1 and tree is not None:
                 for inner_board in feature.geometry.coordinates[1:]:
                     inner_polygon = Polygon(inner_board)
-                    for search_feature in dict_features.values():
-                        if len(search_feature.geometry.coordinates) != 1:
-                            continue
-                        search_polygon = Polygon(search_feature.geometry.coordinates[0])
-                        if (
-                            search_feature.id in result_dict_search_features
-                            and inner_polygon.covers(search_polygon)
-                            and not inner_polygon.contains(search_polygon)
+                    for index in tree.query(inner_polygon, predicate="covers"):
+                        search_id = search_ids[index]
+                        if search_id in result_dict_search_features and not inner_polygon.contains(
+                            search_polygons[index]
                         ):
-                            del result_dict_search_features[search_feature.id]
-                            logging.debug(f"Удаление дублирования внутренней границы: {search_feature.id}")
+                            del result_dict_search_features[search_id]
+                            logging.debug("Удаление дублирования внутренней границы: %s", search_id)
         result_feature_collection = FeatureCollection([])
         for feature in feature_collection.features:
             if feature.geometry.type != "Polygon":
@@ -409,22 +469,28 @@ class ParceGeojson:
         x_coords = np.arange(min_x, max_x + cell_size, cell_size)
         y_coords = np.arange(min_y, max_y + cell_size, cell_size)
 
-        for x in x_coords[:-1]:
-            for y in y_coords[:-1]:
-                cell = shapely.geometry.Polygon(
-                    [
-                        (x, y),
-                        (x + cell_size, y),
-                        (x + cell_size, y + cell_size),
-                        (x, y + cell_size),
-                    ]
-                )
-
-                # Обрезаем ячейку по границам полигона
-                intersection = cell.intersection(polygon)
-                if intersection.is_empty:
-                    continue
-
+        # Все ячейки сетки строятся одним пакетом shapely.polygons из
+        # массива углов (N, 5, 2), а обрезка по полигону и отсев пустых
+        # результатов выполняются поэлементно в C - без скалярных
+        # конструкторов и intersection в python-цикле
+        grid_x, grid_y = np.meshgrid(x_coords[:-1], y_coords[:-1], indexing="ij")
+        x0 = grid_x.ravel()
+        y0 = grid_y.ravel()
+        corners = np.empty((x0.size, 5, 2), dtype=np.float64)
+        corners[:, 0, 0] = x0
+        corners[:, 0, 1] = y0
+        corners[:, 1, 0] = x0 + cell_size
+        corners[:, 1, 1] = y0
+        corners[:, 2, 0] = x0 + cell_size
+        corners[:, 2, 1] = y0 + cell_size
+        corners[:, 3, 0] = x0
+        corners[:, 3, 1] = y0 + cell_size
+        corners[:, 4] = corners[:, 0]
+        cells = shapely.polygons(shapely.linearrings(corners))
+        intersections = shapely.intersection(cells, polygon)
+        intersections = intersections[~shapely.is_empty(intersections)]
+
+        for intersection in intersections:
                 if intersection.geom_type == "Polygon":
                     geometries = [intersection]
                 elif intersection.geom_type == "MultiPolygon":
@@ -446,25 +512,22 @@ class ParceGeojson:
                     # Создаем GeoJSON-полигон
                     geojson_poly = geojson.Polygon(geojson_coords)
 
-                    min_lat, max_lat, min_lon, max_lon = None, None, None, None
-
-                    for line in geojson_poly.coordinates:
-                        for lon, lat in line:
-                            if min_lat is None or lat < min_lat:
-                                min_lat = lat
-                            if max_lat is None or lat > max_lat:
-                                max_lat = lat
-                            if min_lon is None or lon < min_lon:
-                                min_lon = lon
-                            if max_lon is None or lon > max_lon:
-                                max_lon = lon
+                    # Мин/макс по всем кольцам одним numpy-редьюсом вместо
+                    # четырех ветвлений на каждую вершину
+                    all_coords = np.asarray(exterior_coords, dtype=np.float64)
+                    if interior_coords:
+                        all_coords = np.concatenate(
+                            [all_coords] + [np.asarray(ring, dtype=np.float64) for ring in interior_coords]
+                        )
+                    min_lon, min_lat = all_coords.min(axis=0)
+                    max_lon, max_lat = all_coords.max(axis=0)
 
                     # Создаем Feature
                     new_feature = geojson.Feature(
                         id=feature_id,
                         geometry=geojson_poly,
                         properties=tags.copy(),
-                        boundingbox=(min_lon, min_lat, max_lon, max_lat),
+                        boundingbox=(float(min_lon), float(min_lat), float(max_lon), float(max_lat)),
                     )
                     feature_collection.features.append(new_feature)
                     feature_id += 1
@@ -503,9 +566,6 @@ class ParceGeojson:
         """Конструирует полигон моря на основе береговой линии."""
         # pylint: disable=redefined-outer-name
         path = DefaultLocate.OUTPUT_DIR / "Балтика_линия.geojson"
-        with open(path, "r", encoding="utf-8") as f:
-            data: FeatureCollection = geojson.load(f)
-            logging.info(f"Загружен файл GeoJSON: {path}")
 
         # list_line = [
         #     geojson.LineString(coordinates=[(12.570572, 56.062064), (12.635993, 56.096688)]),
@@ -564,8 +624,10 @@ class ParceGeojson:
 
         # data = ParceGeojson.extracting_coastline(data)
 
+        # Потоковый разбор: фильтр применяется к каждой фиче на лету,
+        # отброшенные линии не загружаются в память целой коллекцией
         feature_collection = FeatureCollection([])
-        for feature in data.features:
+        for feature in ParceGeojson.iter_features(path):
             if (
                 feature.id
                 == 16261
@@ -576,6 +638,7 @@ class ParceGeojson:
                 continue
             feature_collection.features.append(feature)
         data = feature_collection
+        logging.info(f"Загружен файл GeoJSON: {path}")
 
         data = ParceGeojson.concat_coastline_sea(feature_collection=data, ind_start_line=1)
 
@@ -587,16 +650,11 @@ class ParceGeojson:
                 feature_collection.features.append(feature)
         data = feature_collection
 
-        with open(
-            DefaultLocate.OUTPUT_DIR / " <Балтика_merged.geojson",
-            "w",
-            encoding="utf-8",
-        ) as f:
-            geojson.dump(data, f, ensure_ascii=False, indent=2)
-            logging.info(
-                f"Сохранен объединенный файл GeoJSON: {str(DefaultLocate.OUTPUT_DIR / 'coastline_merged.geojson')}"
-            )
-            logging.debug(f"Итоговое количество объектов: {len(data.features)}")
+        ParceGeojson.dump_geojson(data, DefaultLocate.OUTPUT_DIR / " <Балтика_merged.geojson")
+        logging.info(
+            f"Сохранен объединенный файл GeoJSON: {str(DefaultLocate.OUTPUT_DIR / 'coastline_merged.geojson')}"
+        )
+        logging.debug(f"Итоговое количество объектов: {len(data.features)}")
 
         list_coord = []
         for coord in data.features[0].geometry.coordinates:
@@ -619,16 +677,11 @@ class ParceGeojson:
                 )
             ]
         )
-        with open(
-            DefaultLocate.OUTPUT_DIR / "Балтика_merged.geojson",
-            "w",
-            encoding="utf-8",
-        ) as f:
-            geojson.dump(data, f, ensure_ascii=False, indent=2)
-            logging.info(
-                f"Сохранен объединенный файл GeoJSON: {str(DefaultLocate.OUTPUT_DIR / 'coastline_merged.geojson')}"
-            )
-            logging.debug(f"Итоговое количество объектов: {len(data.features)}")
+        ParceGeojson.dump_geojson(data, DefaultLocate.OUTPUT_DIR / "Балтика_merged.geojson")
+        logging.info(
+            f"Сохранен объединенный файл GeoJSON: {str(DefaultLocate.OUTPUT_DIR / 'coastline_merged.geojson')}"
+        )
+        logging.debug(f"Итоговое количество объектов: {len(data.features)}")
 
         # temp_feature = Feature()
         # for feature in data.features:
@@ -835,13 +888,8 @@ if __name__ == "__main__":
     # )
     data = ParceGeojson.remove_duplicate_features(data_result)
     logging.debug(f"Количество объектов после объединения: {len(data_result.features)}")
-    with open(
-        DefaultLocate.OUTPUT_DIR / "test_unity.geojson",
-        "w",
-        encoding="utf-8",
-    ) as f:
-        geojson.dump(data, f, ensure_ascii=False, indent=2)
-        logging.info(f"Сохранен объединенный файл GeoJSON: {str(DefaultLocate.OUTPUT_DIR / ".geojson")}")
+    ParceGeojson.dump_geojson(data, DefaultLocate.OUTPUT_DIR / "test_unity.geojson")
+    logging.info(f"Сохранен объединенный файл GeoJSON: {str(DefaultLocate.OUTPUT_DIR / '.geojson')}")
     #
     # data = ParceGeojson.maker_easier(data)
     # with open(